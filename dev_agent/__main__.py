@@ -11,13 +11,24 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
+from . import anthropic_client
 from .config import AgentConfig
 from .issue_processor import process_all_issues
-from .planner import generate_issues_json, generate_plan, get_idea_from_user
+from .planner import (
+    generate_issues_json,
+    generate_plan,
+    get_idea_from_user,
+    save_issues_json,
+    save_plan,
+)
 from .repo_manager import create_staging_branch, generate_scaffolding, setup_repo
 from .state import AgentState
 
@@ -36,12 +47,31 @@ def main() -> None:
     parser.add_argument(
         "--log-level", type=str, default="INFO", help="Logging level"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Regenerate text instead of reusing cached responses",
+    )
     args = parser.parse_args()
 
+    if args.no_cache:
+        # Read by response_cache.cached_call on every call
+        os.environ["DEV_AGENT_NO_CACHE"] = "1"
+
+    # Issue threads only enqueue records; a listener thread writes them to
+    # the terminal, so no worker blocks on stderr.
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S")
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)  # Flushes queued records on exit
     logging.basicConfig(
         level=getattr(logging, args.log_level.upper(), logging.INFO),
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        datefmt="%H:%M:%S",
+        format="%(message)s",  # Timestamp and level are added by the listener
+        handlers=[logging.handlers.QueueHandler(log_queue)],
     )
     logger = logging.getLogger(__name__)
 
@@ -94,32 +124,55 @@ def main() -> None:
     # --- Execute pipeline ---
 
     try:
-        # Step 1-2: Generate plan
-        logger.info("\n=== Step: Generate Plan ===")
-        plan_content = generate_plan(state, state_path)
-
-        # Step 3: Generate issues JSON
-        logger.info("\n=== Step: Generate Issues ===")
-        issues_data = generate_issues_json(state, plan_content, state_path)
-        logger.info("Total issues: %d", len(issues_data))
-
-        # Step 4: Create/connect repo
-        logger.info("\n=== Step: Setup Repository ===")
-        use_existing = bool(args.repo)
-        setup_repo(
-            state,
-            state_path,
-            use_existing=use_existing,
-            existing_repo=args.repo,
-        )
-
-        # Step 5: Generate scaffolding
-        logger.info("\n=== Step: Generate Scaffolding ===")
-        generate_scaffolding(state, plan_content, state_path)
-
-        # Step 6: Create staging branch
-        logger.info("\n=== Step: Create Staging Branch ===")
-        create_staging_branch(state, state_path)
+        # Steps 1-3 (plan, then issues JSON) are generated on a worker
+        # thread while the repo is set up here. The worker writes nothing:
+        # plan.md and issues.json are saved from this thread once the
+        # initial commit exists, so no commit can catch them half-written.
+        ex = ThreadPoolExecutor(max_workers=1)
+        try:
+            # Step 1-2: Generate plan
+            logger.info("\n=== Step: Generate Plan ===")
+            fut_plan = ex.submit(generate_plan, state)
+
+            # Step 3: Generate issues JSON (queued behind the plan on the
+            # single worker, so the plan is ready when it starts)
+            logger.info("\n=== Step: Generate Issues ===")
+            fut_issues = ex.submit(
+                lambda: generate_issues_json(state, fut_plan.result())
+            )
+
+            # Step 4: Create/connect repo
+            logger.info("\n=== Step: Setup Repository ===")
+            use_existing = bool(args.repo)
+            setup_repo(
+                state,
+                state_path,
+                use_existing=use_existing,
+                existing_repo=args.repo,
+            )
+
+            # Both generations must succeed before anything past the
+            # initial commit is pushed, so a failure leaves no scaffold
+            plan_content = fut_plan.result()
+            issues_data = fut_issues.result()
+            if not state.plan_generated:
+                save_plan(state, state_path, plan_content)
+            if not state.issues_json_generated:
+                save_issues_json(state, state_path, issues_data)
+            logger.info("Total issues: %d", len(issues_data))
+
+            # Step 5: Generate scaffolding (commits plan.md and issues.json)
+            logger.info("\n=== Step: Generate Scaffolding ===")
+            generate_scaffolding(state, plan_content, state_path)
+
+            # Step 6: Create staging branch
+            logger.info("\n=== Step: Create Staging Branch ===")
+            create_staging_branch(state, state_path)
+        except BaseException:
+            # Surface the error now rather than after in-flight generation
+            ex.shutdown(wait=False, cancel_futures=True)
+            raise
+        ex.shutdown()
 
         # Steps 7-8: Process all issues
         logger.info("\n=== Step: Process Issues ===")
@@ -129,9 +182,12 @@ def main() -> None:
             plan_content,
             state_path,
             max_retries=config.max_retries,
+            max_workers=config.max_parallel_issues,
+            max_conflict_workers=config.max_conflict_workers,
         )
 
         # Done!
+        anthropic_client.log_usage_totals()
         print("\n" + "=" * 60)
         print("  ALL PHASES COMPLETE")
         print(f"  Repository: https://github.com/{state.repo_full_name}")
@@ -0,0 +1,117 @@
+"""Direct Anthropic SDK access for text generation with prompt caching.
+
+The SDK is optional: when the `anthropic` package is not installed or no
+ANTHROPIC_API_KEY is set, callers fall back to the claude CLI.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+try:
+    import anthropic
+except ImportError:  # Optional dependency
+    anthropic = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = os.environ.get("DEV_AGENT_MODEL", "claude-sonnet-4-0")
+# Cheaper tier for small, low-stakes prompts (PR bodies, reviews)
+FAST_MODEL = os.environ.get("DEV_AGENT_FAST_MODEL", "claude-3-5-haiku-latest")
+MAX_TOKENS = 16000
+
+# Module-level singleton so the HTTP connection pool is reused across calls
+_client = (
+    anthropic.Anthropic()
+    if anthropic is not None and os.environ.get("ANTHROPIC_API_KEY")
+    else None
+)
+
+
+# Token totals for the whole run, from both the SDK and the claude CLI
+_usage_totals = {"input": 0, "output": 0, "cache_read": 0, "cache_write": 0}
+_usage_lock = threading.Lock()
+
+
+def record_usage(usage: dict | None) -> None:
+    """Add one response's token usage (Messages API field names)."""
+    if not usage:
+        return
+    with _usage_lock:
+        _usage_totals["input"] += usage.get("input_tokens") or 0
+        _usage_totals["output"] += usage.get("output_tokens") or 0
+        _usage_totals["cache_read"] += usage.get("cache_read_input_tokens") or 0
+        _usage_totals["cache_write"] += usage.get("cache_creation_input_tokens") or 0
+
+
+def log_usage_totals() -> None:
+    """Log accumulated token usage and the prompt-cache hit rate."""
+    with _usage_lock:
+        totals = dict(_usage_totals)
+    prompt_tokens = totals["input"] + totals["cache_read"] + totals["cache_write"]
+    if not prompt_tokens:
+        return
+    logger.info(
+        "  [usage] in %d, out %d, cache read %d, cache write %d (%.0f%% of prompt tokens cached)",
+        totals["input"],
+        totals["output"],
+        totals["cache_read"],
+        totals["cache_write"],
+        100 * totals["cache_read"] / prompt_tokens,
+    )
+
+
+def is_available() -> bool:
+    """Return True if the SDK is installed and authenticated."""
+    return _client is not None
+
+
+def generate(
+    prompt: str,
+    system: str | None = None,
+    model: str = DEFAULT_MODEL,
+    timeout: int = 600,
+    label: str = "claude-sdk",
+) -> str:
+    """Send one message and return the response text.
+
+    The stable `system` prefix is marked as an ephemeral cache breakpoint so
+    repeated calls sharing it are billed at cache-read rates.
+    """
+    if _client is None:
+        raise RuntimeError("Anthropic SDK is not available")
+
+    kwargs: dict = {}
+    if system:
+        kwargs["system"] = [
+            {
+                "type": "text",
+                "text": system,
+                "cache_control": {"type": "ephemeral"},
+            },
+        ]
+
+    logger.info("  [%s] Starting...", label)
+    resp = _client.messages.create(
+        model=model,
+        max_tokens=MAX_TOKENS,
+        messages=[{"role": "user", "content": prompt}],
+        timeout=timeout,
+        **kwargs,
+    )
+
+    usage = resp.usage
+    record_usage(usage.model_dump())
+    logger.info(
+        "  [%s] Done (in %d, out %d, cache read %d, cache write %d)",
+        label,
+        usage.input_tokens,
+        usage.output_tokens,
+        usage.cache_read_input_tokens or 0,
+        usage.cache_creation_input_tokens or 0,
+    )
+    return "".join(
+        block.text for block in resp.content if block.type == "text"
+    ).strip()
@@ -2,13 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
+import os
 import re
+import shlex
 import subprocess
 import sys
+import tempfile
 import threading
 import time
+from dataclasses import dataclass
+from typing import Iterator
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # Optional dependency
+    from json import loads as _json_loads
+
+from . import anthropic_client, git_worker
+from .response_cache import cached_call
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +35,25 @@ _DIM = "\033[2m"
 _BOLD = "\033[1m"
 _RESET = "\033[0m"
 
+# PR numbers in the URLs printed by `gh pr create`
+_PR_NUM_RE = re.compile(r"/pull/(\d+)")
+
+# Defaults for every child process (git, gh, and the git calls claude
+# makes): status reads skip the optional index refresh, so they never contend
+# for index.lock across parallel worktrees, and gh skips its update check.
+# Values already set by the user win; our own process env is left untouched.
+_GIT_GH_DEFAULTS = {
+    "GIT_OPTIONAL_LOCKS": "0",
+    "GH_NO_UPDATE_NOTIFIER": "1",
+    "GH_PROMPT_DISABLED": "1",
+}
+
+
+def _child_env() -> dict[str, str]:
+    """Environment for a child process, built per call so later changes to
+    os.environ (tokens, DEV_AGENT_* flags) still reach it."""
+    return {**_GIT_GH_DEFAULTS, **os.environ}
+
 
 # --- Exceptions ---
 
@@ -46,26 +80,118 @@ def _run(
     timeout: int = 600,
     check: bool = True,
 ) -> subprocess.CompletedProcess:
-    """Run a subprocess. All CLI calls route through here."""
+    """Run a subprocess. All CLI calls route through here.
+
+    Output is returned as raw bytes; use _run_text when the caller needs
+    to read stdout, so return-code-only callers skip the decode.
+    """
     logger.debug("Running: %s", " ".join(cmd))
     result = subprocess.run(
         cmd,
         cwd=cwd,
+        env=_child_env(),
         capture_output=True,
-        text=True,
-        input=input_text,
+        input=input_text.encode("utf-8") if input_text is not None else None,
         timeout=timeout,
     )
     if check and result.returncode != 0:
-        stderr_lower = result.stderr.lower()
-        stdout_lower = result.stdout.lower()
-        if "conflict" in stdout_lower or "merge conflict" in stderr_lower:
-            raise MergeConflictError(" ".join(cmd), result.returncode, result.stderr)
-        raise CLIError(" ".join(cmd), result.returncode, result.stderr)
-    logger.debug("Output: %s", result.stdout[:500])
+        stderr = result.stderr.decode("utf-8", "replace")
+        if b"conflict" in result.stdout.lower() or "merge conflict" in stderr.lower():
+            raise MergeConflictError(" ".join(cmd), result.returncode, stderr)
+        raise CLIError(" ".join(cmd), result.returncode, stderr)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Output: %s", result.stdout[:500].decode("utf-8", "replace"))
+    return result
+
+
+def _run_text(
+    cmd: list[str],
+    cwd: str | None = None,
+    input_text: str | None = None,
+    timeout: int = 600,
+    check: bool = True,
+) -> subprocess.CompletedProcess:
+    """Like _run, but with stdout and stderr decoded to str."""
+    result = _run(cmd, cwd=cwd, input_text=input_text, timeout=timeout, check=check)
+    result.stdout = result.stdout.decode("utf-8", "replace")
+    result.stderr = result.stderr.decode("utf-8", "replace")
     return result
 
 
+def _run_head(
+    cmd: list[str],
+    cwd: str | None = None,
+    max_bytes: int = 15000,
+    timeout: int = 600,
+    check: bool = True,
+) -> tuple[bytes, bool]:
+    """Run a subprocess, reading at most `max_bytes` of its stdout.
+
+    The child is terminated as soon as the limit is exceeded, so callers
+    that only keep a prefix never buffer (or wait for) the full output.
+    Returns (data, truncated).
+    """
+    logger.debug("Running: %s", " ".join(cmd))
+    # stderr goes to a file: a child filling a stderr pipe while we block
+    # on stdout would deadlock
+    with tempfile.TemporaryFile() as err, subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=_child_env(),
+        stdout=subprocess.PIPE,
+        stderr=err,
+    ) as proc:
+        data = proc.stdout.read(max_bytes + 1)
+        if len(data) > max_bytes:
+            proc.terminate()
+            proc.wait(timeout=timeout)
+            return data[:max_bytes], True
+        returncode = proc.wait(timeout=timeout)
+        err.seek(0)
+        stderr = err.read().decode("utf-8", "replace")
+    if check and returncode != 0:
+        raise CLIError(" ".join(cmd), returncode, stderr)
+    return data, False
+
+
+def _diff_sections(cmd: list[str], cwd: str, check: bool = True) -> Iterator[str]:
+    """Stream a unified diff from `cmd`, one file section at a time.
+
+    Lines are read as git/gh produce them, so at most one file's section is
+    held in memory. Closing the generator early terminates the child.
+    """
+    logger.debug("Running: %s", " ".join(cmd))
+    # stderr goes to a file, as in _run_head, so it can never fill a pipe
+    # while the diff is being read
+    with tempfile.TemporaryFile() as err, subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=_child_env(),
+        stdout=subprocess.PIPE,
+        stderr=err,
+    ) as proc:
+        finished = False
+        try:
+            section: list[str] = []
+            for raw in proc.stdout:
+                line = raw.decode("utf-8", "replace")
+                if line.startswith("diff --git ") and section:
+                    yield "".join(section)
+                    section = []
+                section.append(line)
+            if section:
+                yield "".join(section)
+            finished = True
+        finally:
+            if not finished:
+                proc.terminate()
+        returncode = proc.wait()
+        err.seek(0)
+        stderr = err.read().decode("utf-8", "replace")
+    if check and returncode != 0:
+        raise CLIError(" ".join(cmd), returncode, stderr)
+
+
 def _display_stream_event(event: dict, label: str) -> None:
     """Print a human-readable line for each stream-json event."""
     etype = event.get("type", "")
@@ -121,11 +247,21 @@ def _display_stream_event(event: dict, label: str) -> None:
         # Tool result — show abbreviated
         content = event.get("content", "")
         if isinstance(content, list):
-            # Extract text from content blocks
-            texts = [b.get("text", "") for b in content if b.get("type") == "text"]
+            # Join text blocks only until the preview is full
+            texts: list[str] = []
+            total = 0
+            for b in content:
+                if b.get("type") == "text":
+                    text = b.get("text", "")[:151]
+                    texts.append(text)
+                    total += len(text) + 1
+                    if total > 151:
+                        break
             content = " ".join(texts)
-        preview = str(content)[:150].replace("\n", " ")
-        if len(str(content)) > 150:
+        else:
+            content = str(content)
+        preview = content[:150].replace("\n", " ")
+        if len(content) > 150:
             preview += "..."
         print(
             f"  {_CYAN}[{label}]{_RESET} {_DIM}Result: {preview}{_RESET}",
@@ -143,7 +279,11 @@ def _display_stream_event(event: dict, label: str) -> None:
         )
 
 
-def _run_claude(
+# stream-json lines can carry whole file contents in tool results
+_STREAM_LINE_LIMIT = 64 * 1024 * 1024
+
+
+async def _run_claude_async(
     cmd: list[str],
     cwd: str | None = None,
     input_text: str | None = None,
@@ -158,58 +298,58 @@ def _run_claude(
     logger.info("  [%s] Starting...", label)
     start = time.time()
 
-    proc = subprocess.Popen(
-        cmd,
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
         cwd=cwd,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=sys.stderr,
-        text=True,
+        env=_child_env(),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        limit=_STREAM_LINE_LIMIT,
     )
 
     # Write prompt to stdin and close
     if input_text:
-        proc.stdin.write(input_text)
+        proc.stdin.write(input_text.encode("utf-8"))
+        await proc.stdin.drain()
     proc.stdin.close()
 
-    # Read stdout line-by-line (each line is a JSON event)
+    # Only the final result event is retained; every other line is
+    # displayed and dropped so long sessions don't accumulate in memory.
     result_text = ""
-    read_done = threading.Event()
 
-    def _read_and_display():
+    async def _read_and_display():
         nonlocal result_text
-        try:
-            for line in proc.stdout:
-                stripped = line.strip()
-                if not stripped:
-                    continue
-                try:
-                    event = json.loads(stripped)
-                    _display_stream_event(event, label)
-                    # Capture the final result
-                    if event.get("type") == "result":
-                        result_text = event.get("result", "")
-                except json.JSONDecodeError:
-                    # Not JSON — print raw
-                    print(
-                        f"  {_CYAN}[{label}]{_RESET} {stripped}",
-                        file=sys.stderr, flush=True,
-                    )
-        finally:
-            read_done.set()
-
-    reader = threading.Thread(target=_read_and_display, daemon=True)
-    reader.start()
+        # Read stdout line-by-line (each line is a JSON event)
+        async for raw in proc.stdout:
+            # NDJSON: leading whitespace is never significant
+            stripped = raw.decode("utf-8", "replace").rstrip()
+            if not stripped:
+                continue
+            try:
+                event = _json_loads(stripped)
+            except json.JSONDecodeError:
+                # Not JSON — print raw
+                print(
+                    f"  {_CYAN}[{label}]{_RESET} {stripped}",
+                    file=sys.stderr, flush=True,
+                )
+                continue
+            _display_stream_event(event, label)
+            # Capture the final result
+            if event.get("type") == "result":
+                result_text = event.get("result", "")
+                anthropic_client.record_usage(event.get("usage"))
 
     # Wait for process with timeout
     try:
-        proc.wait(timeout=timeout)
-    except subprocess.TimeoutExpired:
+        await asyncio.wait_for(
+            asyncio.gather(_read_and_display(), proc.wait()), timeout
+        )
+    except asyncio.TimeoutError:
         proc.kill()
-        proc.wait()
+        await proc.wait()
         raise subprocess.TimeoutExpired(cmd, timeout) from None
 
-    read_done.wait(timeout=10)
     elapsed = int(time.time() - start)
 
     logger.info("  [%s] Process exited in %ds (code %d)", label, elapsed, proc.returncode)
@@ -225,20 +365,96 @@ def _run_claude(
     )
 
 
+def _run_claude(
+    cmd: list[str],
+    cwd: str | None = None,
+    input_text: str | None = None,
+    timeout: int = 600,
+    label: str = "claude",
+) -> subprocess.CompletedProcess:
+    """Blocking wrapper around _run_claude_async for synchronous callers."""
+    return asyncio.run(_run_claude_async(cmd, cwd, input_text, timeout, label))
+
+
 # --- Claude Code calls ---
 
 
-def claude_generate(prompt: str, cwd: str | None = None, timeout: int = 600) -> str:
-    """Call claude -p with sonnet for fast text generation. Full output visible."""
+def _use_sdk() -> bool:
+    return not os.environ.get("DEV_AGENT_USE_CLI") and anthropic_client.is_available()
+
+
+def estimate_tokens(text: str) -> int:
+    # Code, diffs and prose average roughly 3 characters per token
+    return len(text) // 3 + 1
+
+
+# Prompts up to this many estimated tokens may go to the fast model tier
+_FAST_TIER_MAX_TOKENS = 4000
+
+
+def _generation_model(
+    prompt: str, *args, system: str | None = None, fast: bool = False, **kwargs
+) -> str:
+    """Return the model that serves a claude_generate call.
+
+    With `fast`, a small enough prompt goes to the cheaper, quicker tier.
+    """
+    small = (
+        fast
+        and estimate_tokens(prompt) + estimate_tokens(system or "")
+        <= _FAST_TIER_MAX_TOKENS
+    )
+    if _use_sdk():
+        return anthropic_client.FAST_MODEL if small else anthropic_client.DEFAULT_MODEL
+    return "haiku" if small else "sonnet"
+
+
+@cached_call(model=_generation_model)
+def claude_generate(
+    prompt: str,
+    cwd: str | None = None,
+    timeout: int = 600,
+    system: str | None = None,
+    fast: bool = False,
+) -> str:
+    """Generate text with sonnet, or haiku for small `fast` prompts.
+
+    Uses the Anthropic SDK (with `system` as a cached prefix) when it is
+    available; set DEV_AGENT_USE_CLI=1 to force the claude CLI instead.
+    Responses are cached on disk (see response_cache). Live event output
+    is only streamed at DEBUG log level.
+    """
+    model = _generation_model(prompt, system=system, fast=fast)
+    if _use_sdk():
+        return anthropic_client.generate(
+            prompt, system=system, model=model, timeout=timeout
+        )
+
+    if system:
+        prompt = f"{system}\n\n{prompt}"
+    base_cmd = [
+        "claude", "-p",
+        "--dangerously-skip-permissions",
+        "--model", model,
+        "--no-session-persistence",
+    ]
+
+    if not logger.isEnabledFor(logging.DEBUG):
+        # Only the final result is used, so ask for a single JSON document
+        # instead of streaming and decoding every intermediate event.
+        logger.info("  [claude-generate] Starting...")
+        result = _run_text(
+            base_cmd + ["--output-format", "json"],
+            cwd=cwd,
+            input_text=prompt,
+            timeout=timeout,
+        )
+        data = _json_loads(result.stdout)
+        anthropic_client.record_usage(data.get("usage"))
+        return data.get("result", "").strip()
+
     result = _run_claude(
-        [
-            "claude", "-p",
-            "--dangerously-skip-permissions",
-            "--model", "sonnet",
-            "--verbose",
-            "--output-format", "stream-json",
-            "--no-session-persistence",
-        ],
+        base_cmd + ["--verbose", "--output-format", "stream-json"],
         cwd=cwd,
         input_text=prompt,
         timeout=timeout,
@@ -247,16 +463,35 @@ def claude_generate(prompt: str, cwd: str | None = None, timeout: int = 600) ->
     return result.stdout.strip()
 
 
-def claude_code_implement(prompt: str, cwd: str, timeout: int = 1800) -> str:
-    """Call claude -p with full tool access. Full output visible."""
+# Linux caps a single argv string at 128 KiB (MAX_ARG_STRLEN)
+_MAX_ARG_BYTES = 100_000
+
+
+def claude_code_implement(
+    prompt: str, cwd: str, timeout: int = 1800, system: str | None = None
+) -> str:
+    """Call claude -p with full tool access. Full output visible.
+
+    `system` is appended to Claude Code's own system prompt, which the CLI
+    marks as a cache breakpoint, so a prefix shared by many calls is billed
+    at cache-read rates. Oversized system text is sent ahead of `prompt`.
+    """
+    _snapshot_cached.cache_clear()
+    _checked_out.pop(cwd, None)
+    cmd = [
+        "claude", "-p",
+        "--dangerously-skip-permissions",
+        "--verbose",
+        "--output-format", "stream-json",
+        "--no-session-persistence",
+    ]
+    if system:
+        if len(system.encode("utf-8")) <= _MAX_ARG_BYTES:
+            cmd += ["--append-system-prompt", system]
+        else:
+            prompt = f"{system}\n\n{prompt}"
     result = _run_claude(
-        [
-            "claude", "-p",
-            "--dangerously-skip-permissions",
-            "--verbose",
-            "--output-format", "stream-json",
-            "--no-session-persistence",
-        ],
+        cmd,
         cwd=cwd,
         input_text=prompt,
         timeout=timeout,
@@ -268,17 +503,35 @@ def claude_code_implement(prompt: str, cwd: str, timeout: int = 1800) -> str:
 # --- Git calls ---
 
 
+# Branch last checked out by git_checkout, per directory. Dropped by any
+# command that may move HEAD to another branch.
+_checked_out: dict[str, str] = {}
+_BRANCH_SWITCHING = frozenset({"checkout", "switch", "branch", "rebase", "reset"})
+
+
 def git(args: list[str], cwd: str, check: bool = True) -> str:
-    result = _run(["git"] + args, cwd=cwd, check=check)
+    _snapshot_cached.cache_clear()
+    if args and args[0] in _BRANCH_SWITCHING:
+        _checked_out.pop(cwd, None)
+    result = _run_text(["git"] + args, cwd=cwd, check=check)
     return result.stdout.strip()
 
 
 def git_checkout(branch: str, cwd: str, create: bool = False) -> str:
+    # Already there: skip the checkout. The tracker answers without any
+    # git call; otherwise HEAD is read directly.
+    if not create and (
+        _checked_out.get(cwd) == branch or git_current_branch(cwd) == branch
+    ):
+        _checked_out[cwd] = branch
+        return ""
     args = ["checkout"]
     if create:
         args.append("-b")
     args.append(branch)
-    return git(args, cwd)
+    output = git(args, cwd)
+    _checked_out[cwd] = branch
+    return output
 
 
 def git_add_all(cwd: str) -> str:
@@ -300,78 +553,280 @@ def git_push(cwd: str, branch: str | None = None, set_upstream: bool = False) ->
     return git(args, cwd)
 
 
+def git_script(commands: list[list[str]], cwd: str) -> str:
+    """Run several git commands in one shell, stopping at the first failure.
+
+    Each entry is a git argument list, as for git(); one fork replaces one
+    per command.
+    """
+    _snapshot_cached.cache_clear()
+    if any(args and args[0] in _BRANCH_SWITCHING for args in commands):
+        _checked_out.pop(cwd, None)
+    script = " && ".join(shlex.join(["git"] + args) for args in commands)
+    result = _run_text(["sh", "-c", script], cwd=cwd)
+    return result.stdout.strip()
+
+
+def git_add_commit_push(
+    message: str, cwd: str, branch: str, set_upstream: bool = False
+) -> bool:
+    """Stage everything, commit, and push in a single shell invocation.
+
+    Returns False without running anything when the working tree is clean.
+    """
+    if not git_has_changes(cwd):
+        return False
+    push = ["push", "-u", "origin"] if set_upstream else ["push", "origin"]
+    git_script([["add", "-A"], ["commit", "-m", message], push + [branch]], cwd)
+    return True
+
+
 def git_merge(branch: str, cwd: str, no_ff: bool = False) -> str:
     args = ["merge"]
     if no_ff:
         args.append("--no-ff")
     args.append(branch)
-    result = _run(["git"] + args, cwd=cwd, check=True)
+    _snapshot_cached.cache_clear()
+    result = _run_text(["git"] + args, cwd=cwd, check=True)
     return result.stdout.strip()
 
 
-def git_has_changes(cwd: str) -> bool:
-    result = _run(["git", "status", "--porcelain"], cwd=cwd, check=False)
-    return bool(result.stdout.strip())
+@dataclass(frozen=True)
+class RepoSnapshot:
+    """Working-tree status captured by a single `git status` call."""
+
+    branch: str
+    conflicted: tuple[str, ...]
+    has_changes: bool
 
 
-def git_conflicted_files(cwd: str) -> list[str]:
-    result = _run(
-        ["git", "diff", "--name-only", "--diff-filter=U"], cwd=cwd, check=False
+@functools.lru_cache(maxsize=8)
+def _snapshot_cached(cwd: str, _second: int) -> RepoSnapshot:
+    worker = git_worker.get_worker(cwd)
+    if worker is not None:
+        try:
+            conflicted, has_changes = worker.status()
+            return RepoSnapshot(worker.current_branch(), conflicted, has_changes)
+        except Exception as e:
+            logger.debug("pygit2 status failed, using git CLI: %s", e)
+
+    result = _run_text(
+        ["git", "status", "--porcelain=v2", "--branch", "-uall"],
+        cwd=cwd,
+        check=False,
     )
-    return [f for f in result.stdout.strip().split("\n") if f]
+    branch = "HEAD"
+    conflicted: list[str] = []
+    has_changes = False
+    for line in result.stdout.splitlines():
+        if line.startswith("# branch.head "):
+            head = line[len("# branch.head "):]
+            if head != "(detached)":
+                branch = head
+        elif line.startswith("#"):
+            continue
+        else:
+            has_changes = True
+            if line.startswith("u "):
+                # u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+                conflicted.append(line.split(" ", 10)[10])
+    return RepoSnapshot(branch, tuple(conflicted), has_changes)
+
+
+def git_repo_snapshot(cwd: str) -> RepoSnapshot:
+    """Branch, conflicts, and dirty flag from one git process (or from an
+    in-process pygit2 repository when available).
+
+    Memoized for about a second; any mutating git helper clears the memo.
+    """
+    return _snapshot_cached(cwd, int(time.monotonic()))
+
+
+def git_has_changes(cwd: str) -> bool:
+    """Return True if the working tree has any staged, unstaged, or
+    untracked change.
+
+    Without pygit2 this reads a single byte of `git status --porcelain`
+    and stops git there, instead of listing every changed path.
+    """
+    if git_worker.get_worker(cwd) is not None:
+        return git_repo_snapshot(cwd).has_changes
+    _, any_output = _run_head(
+        ["git", "status", "--porcelain"], cwd=cwd, max_bytes=0, check=False
+    )
+    return any_output
 
 
 def git_current_branch(cwd: str) -> str:
-    return git(["rev-parse", "--abbrev-ref", "HEAD"], cwd)
+    """Return the checked-out branch ("HEAD" when detached).
 
+    Reads HEAD alone (in-process with pygit2), never the working-tree
+    status, so it costs less than the checkout it is used to skip.
+    """
+    worker = git_worker.get_worker(cwd)
+    if worker is not None:
+        return worker.current_branch()
+    result = _run_text(
+        ["git", "symbolic-ref", "--short", "-q", "HEAD"], cwd=cwd, check=False
+    )
+    return result.stdout.strip() or "HEAD"
 
-def git_diff_branch(base: str, head: str, cwd: str) -> str:
-    """Return the diff between two branches (base...head)."""
-    result = _run(["git", "diff", f"{base}...{head}"], cwd=cwd, check=False)
-    return result.stdout
+
+def git_diff_branch_sections(base: str, head: str, cwd: str) -> Iterator[str]:
+    """Stream the base...head diff one file section at a time."""
+    return _diff_sections(["git", "diff", f"{base}...{head}"], cwd, check=False)
 
 
 # --- GitHub (gh) calls ---
 
 
+class _TokenBucket:
+    """Blocking token bucket: up to `capacity` calls burst, then `rate`/s."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int = 1) -> None:
+        n = min(n, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Reserve now, sleep outside the lock; concurrent callers queue up
+            self._tokens -= n
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            logger.info("  [gh] Write rate limit reached, waiting %.1fs", delay)
+            time.sleep(delay)
+
+
+# GitHub's secondary limits on content-creating requests: 80 per minute and
+# 500 per hour (one every 7.2s sustained). Only calls that create content
+# (issues, comments, PRs) are charged; merges and edits are not covered.
+_gh_write_limiter = _TokenBucket(rate=500 / 3600, capacity=80)
+
+
 def gh_repo_create(
     name: str,
     cwd: str,
     private: bool = True,
     description: str = "",
+    source: bool = True,
 ) -> str:
-    """Create a GitHub repo from the local directory. Returns the repo URL."""
+    """Create a GitHub repo and return its URL.
+
+    With `source`, the local directory becomes its origin and is pushed;
+    otherwise only the empty remote is created (see gh_git_remote_url).
+    """
     cmd = ["gh", "repo", "create", name]
     cmd.append("--private" if private else "--public")
     if description:
         cmd.extend(["--description", description])
-    cmd.extend(["--source", cwd, "--push"])
-    result = _run(cmd, cwd=cwd)
+    if source:
+        cmd.extend(["--source", cwd, "--push"])
+    result = _run_text(cmd, cwd=cwd)
     return result.stdout.strip()
 
 
+def gh_git_remote_url(repo: str) -> str:
+    """Git URL for owner/name in the protocol gh is configured to use."""
+    result = _run_text(["gh", "config", "get", "git_protocol"], check=False)
+    if result.stdout.strip() == "ssh":
+        return f"git@github.com:{repo}.git"
+    return f"https://github.com/{repo}.git"
+
+
 def gh_repo_clone(repo: str, target_dir: str) -> str:
-    result = _run(["gh", "repo", "clone", repo, target_dir])
+    result = _run_text(["gh", "repo", "clone", repo, target_dir])
     return result.stdout.strip()
 
 
-def gh_issue_create(title: str, body: str, labels: list[str], cwd: str) -> int:
-    """Create a GitHub issue. Returns the issue number."""
-    cmd = ["gh", "issue", "create", "--title", title, "--body", body]
-    for label in labels:
-        cmd.extend(["--label", label])
-    result = _run(cmd, cwd=cwd)
-    url = result.stdout.strip()
-    match = re.search(r"/issues/(\d+)", url)
-    if match:
-        return int(match.group(1))
-    raise CLIError("gh issue create", 0, f"Could not parse issue number from: {url}")
+def gh_graphql(
+    query: str, cwd: str, variables: dict | None = None, partial: bool = False
+) -> dict:
+    """Run one GraphQL request through `gh api graphql`. Returns `data`.
+
+    With `partial`, a response carrying both `errors` and `data` (some
+    mutation fields failed, others ran) returns the data after logging the
+    errors; the failed fields are null. Otherwise any error raises.
+    """
+    payload = json.dumps({"query": query, "variables": variables or {}})
+    # gh exits non-zero on GraphQL errors but still prints the response
+    result = _run_text(
+        ["gh", "api", "graphql", "--input", "-"],
+        cwd=cwd,
+        input_text=payload,
+        check=False,
+    )
+    try:
+        response = json.loads(result.stdout)
+    except ValueError:
+        raise CLIError("gh api graphql", result.returncode, result.stderr) from None
+    errors = response.get("errors")
+    if errors and partial and response.get("data"):
+        logger.warning("  [graphql] Partial failure: %s", json.dumps(errors))
+        return response["data"]
+    if errors or result.returncode != 0:
+        raise CLIError(
+            "gh api graphql",
+            result.returncode,
+            json.dumps(errors) if errors else result.stderr,
+        )
+    return response["data"]
+
+
+@functools.lru_cache(maxsize=8)
+def gh_repo_id(cwd: str) -> str:
+    """Return the GraphQL node ID of the repository at `cwd`."""
+    result = _run_text(["gh", "repo", "view", "--json", "id", "--jq", ".id"], cwd=cwd)
+    return result.stdout.strip()
+
+
+def gh_issues_create_bulk(
+    issues: list[tuple[str, str]], cwd: str
+) -> list[int | None]:
+    """Create several issues in a single GraphQL mutation.
+
+    `issues` is a list of (title, body) pairs. Returns the issue numbers in
+    the same order (top-level mutation fields execute sequentially), with
+    None for each issue GitHub did not create.
+    """
+    if not issues:
+        return []
+    _gh_write_limiter.acquire(len(issues))
+
+    params = ["$repo: ID!"]
+    fields = []
+    variables: dict = {"repo": gh_repo_id(cwd)}
+    for i, (title, body) in enumerate(issues):
+        params.append(f"$t{i}: String!, $b{i}: String")
+        fields.append(
+            f"i{i}: createIssue(input: {{repositoryId: $repo, title: $t{i}, "
+            f"body: $b{i}}}) {{ issue {{ number }} }}"
+        )
+        variables[f"t{i}"] = title
+        variables[f"b{i}"] = body
+
+    query = f"mutation({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}"
+    data = gh_graphql(query, cwd, variables, partial=True)
+    numbers = []
+    for i in range(len(issues)):
+        created = data.get(f"i{i}") or {}
+        numbers.append((created.get("issue") or {}).get("number"))
+    return numbers
 
 
 def gh_pr_create(
     title: str, body: str, base: str, head: str, cwd: str
 ) -> int:
     """Create a PR. Returns the PR number."""
+    _gh_write_limiter.acquire()
     cmd = [
         "gh", "pr", "create",
         "--title", title,
@@ -379,9 +834,9 @@ def gh_pr_create(
         "--base", base,
         "--head", head,
     ]
-    result = _run(cmd, cwd=cwd)
+    result = _run_text(cmd, cwd=cwd)
     url = result.stdout.strip()
-    match = re.search(r"/pull/(\d+)", url)
+    match = _PR_NUM_RE.search(url)
     if match:
         return int(match.group(1))
     raise CLIError("gh pr create", 0, f"Could not parse PR number from: {url}")
@@ -395,20 +850,27 @@ def gh_pr_merge(
         cmd.append("--squash")
     else:
         cmd.append("--merge")
-    if delete_branch:
-        cmd.append("--delete-branch")
-    result = _run(cmd, cwd=cwd)
-    return result.stdout.strip()
+    if not delete_branch:
+        return _run_text(cmd, cwd=cwd).stdout.strip()
+
+    cmd.append("--delete-branch")
+    try:
+        return _run_text(cmd, cwd=cwd).stdout.strip()
+    finally:
+        # gh switches the local checkout off the deleted branch, so both the
+        # tracked branch and any snapshot taken meanwhile are stale
+        _snapshot_cached.cache_clear()
+        _checked_out.pop(cwd, None)
 
 
-def gh_pr_diff(pr_number: int, cwd: str) -> str:
-    result = _run(["gh", "pr", "diff", str(pr_number)], cwd=cwd)
-    return result.stdout
+def gh_pr_diff_sections(pr_number: int, cwd: str) -> Iterator[str]:
+    """Stream the PR diff one file section at a time."""
+    return _diff_sections(["gh", "pr", "diff", str(pr_number)], cwd)
 
 
 def gh_pr_view(pr_number: int, cwd: str) -> str:
     """Fetch the PR body (description) as raw text."""
-    result = _run(
+    result = _run_text(
         ["gh", "pr", "view", str(pr_number), "--json", "body", "--jq", ".body"],
         cwd=cwd,
     )
@@ -417,18 +879,45 @@ def gh_pr_view(pr_number: int, cwd: str) -> str:
 
 def gh_pr_edit(pr_number: int, cwd: str, body: str) -> str:
     """Update the PR body with new content."""
-    result = _run(
+    result = _run_text(
         ["gh", "pr", "edit", str(pr_number), "--body", body],
         cwd=cwd,
     )
     return result.stdout.strip()
 
 
-def gh_issue_close(
-    issue_number: int, cwd: str, comment: str = ""
-) -> str:
-    cmd = ["gh", "issue", "close", str(issue_number), "--reason", "completed"]
-    if comment:
-        cmd.extend(["--comment", comment])
-    result = _run(cmd, cwd=cwd)
-    return result.stdout.strip()
+def gh_issues_close_bulk(closures: list[tuple[int, str]], cwd: str) -> None:
+    """Comment on and close several issues as completed.
+
+    `closures` is a list of (issue number, comment) pairs. Costs one
+    GraphQL query for the issue IDs and one mutation, whatever the count.
+    """
+    if not closures:
+        return
+    lookups = "\n".join(
+        f"i{i}: issue(number: {number}) {{ id }}"
+        for i, (number, _) in enumerate(closures)
+    )
+    data = gh_graphql(
+        f"query($repo: ID!) {{ node(id: $repo) {{ ... on Repository {{\n{lookups}\n}} }} }}",
+        cwd,
+        {"repo": gh_repo_id(cwd)},
+    )
+    issue_ids = [data["node"][f"i{i}"]["id"] for i in range(len(closures))]
+
+    _gh_write_limiter.acquire(len(closures))
+    params = []
+    fields = []
+    variables: dict = {}
+    for i, (issue_id, (_, comment)) in enumerate(zip(issue_ids, closures)):
+        params.append(f"$id{i}: ID!, $m{i}: String!")
+        fields.append(
+            f"c{i}: addComment(input: {{subjectId: $id{i}, body: $m{i}}}) "
+            f"{{ clientMutationId }}\n"
+            f"x{i}: closeIssue(input: {{issueId: $id{i}, stateReason: COMPLETED}}) "
+            f"{{ issue {{ number }} }}"
+        )
+        variables[f"id{i}"] = issue_id
+        variables[f"m{i}"] = comment
+    query = f"mutation({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}"
+    gh_graphql(query, cwd, variables)
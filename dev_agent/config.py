@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -11,11 +12,15 @@ class AgentConfig:
     claude_timeout: int = 300
     code_gen_timeout: int = 600
     max_retries: int = 2
+    max_conflict_workers: int = 4
+    max_parallel_issues: int = 4
     auto_merge: bool = True
     squash_feature_merges: bool = True
     private_repo: bool = True
     log_level: str = "INFO"
 
-    @property
-    def state_filename(self) -> str:
-        return f"{self.state_dir}/{self.state_file}"
+    # Derived from state_dir/state_file once at construction
+    state_filename: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.state_filename = os.path.join(self.state_dir, self.state_file)
@@ -3,71 +3,209 @@
 from __future__ import annotations
 
 import logging
-import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from .cli_bridge import claude_generate, git_conflicted_files
+from .cli_bridge import claude_generate, git_repo_snapshot
+from .config import AgentConfig
 
 logger = logging.getLogger(__name__)
 
-
-def resolve_conflicts(cwd: str, feature_description: str) -> None:
-    """Detect conflicted files, resolve each with Claude, write back."""
-    conflicted = git_conflicted_files(cwd)
+_FILE_BLOCK_RE = re.compile(r"<FILE>\n?(.*)</FILE>", re.DOTALL)
+_HUNK_BLOCK_RE = re.compile(r"<HUNK (\d+)>\n?(.*?)</HUNK>", re.DOTALL)
+_CONFLICT_START_RE = re.compile(r"^<<<<<<<", re.MULTILINE)
+# Any conflict marker line, including a lone separator or end marker
+_CONFLICT_MARKER_RE = re.compile(r"^(?:<{7}|={7}|>{7})(?:[ \r]|$)", re.MULTILINE)
+
+# Files up to this many lines are sent whole; longer ones only as their
+# conflicted regions plus this much context on either side
+_WHOLE_FILE_MAX_LINES = 200
+_HUNK_CONTEXT_LINES = 20
+
+
+def resolve_conflicts(
+    cwd: str,
+    feature_description: str,
+    max_workers: int = AgentConfig.max_conflict_workers,
+) -> None:
+    """Detect conflicted files, resolve them concurrently with Claude, write back."""
+    conflicted = git_repo_snapshot(cwd).conflicted
     if not conflicted:
         logger.info("No conflicted files found")
         return
 
     logger.info("Resolving conflicts in %d file(s): %s", len(conflicted), conflicted)
 
-    for file_path in conflicted:
-        abs_path = os.path.join(cwd, file_path)
-        with open(abs_path, "r") as f:
-            content = f.read()
-
-        # Verify it actually has conflict markers
-        if "<<<<<<" not in content:
-            logger.warning(
-                "  %s marked as conflicted but has no markers, skipping", file_path
-            )
-            continue
+    # Files are independent, so each Claude round-trip can run in parallel
+    workers = max(1, min(max_workers, len(conflicted)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(_resolve_one, cwd, file_path, feature_description)
+            for file_path in conflicted
+        ]
+        for future in futures:
+            future.result()
+
+
+def _resolve_one(cwd: str, file_path: str, feature_description: str) -> None:
+    """Resolve a single conflicted file in place."""
+    path = Path(cwd, file_path)
+    data = path.read_bytes()
+
+    # Verify it actually has conflict markers before decoding anything
+    if b"<<<<<<<" not in data:
+        logger.warning(
+            "  %s marked as conflicted but has no markers, skipping", file_path
+        )
+        return
 
-        resolved = _resolve_single_file(content, file_path, feature_description)
+    # Never round-trip through a lossy decode: that would rewrite every
+    # non-UTF-8 byte in the file, not just the conflicted lines
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError(f"{file_path} is not UTF-8; resolve it manually") from None
+    resolved = _resolve_single_file(content, file_path, feature_description)
 
-        with open(abs_path, "w") as f:
-            f.write(resolved)
+    path.write_bytes(resolved.encode("utf-8"))
 
-        logger.info("  Resolved: %s", file_path)
+    logger.info("  Resolved: %s", file_path)
 
 
 def _resolve_single_file(
     content: str, file_path: str, feature_description: str
 ) -> str:
-    """Send a conflicted file to Claude for resolution, with one retry."""
+    """Send a conflicted file to Claude for resolution in a single call.
+
+    Large files send only their conflicted regions (see _resolve_hunks),
+    falling back to the whole file if the reply is incomplete. Any markers
+    Claude leaves behind are collapsed locally rather than paying for a
+    second round-trip.
+    """
     from .prompts import resolve_conflict_prompt
 
-    resolved = claude_generate(
-        resolve_conflict_prompt(content, file_path, feature_description),
-        timeout=120,
-    )
-    resolved = _strip_code_fences(resolved)
-
-    # Verify markers are removed
-    if "<<<<<<" in resolved or "=======" in resolved or ">>>>>>" in resolved:
-        logger.warning("  First resolution still has markers, retrying for %s", file_path)
-        resolved = claude_generate(
-            f"The following text still contains merge conflict markers. "
-            f"Remove ALL lines containing <<<<<<, ======, >>>>>> and produce "
-            f"the clean merged file:\n\n{resolved}",
-            timeout=60,
-        )
+    lines = content.splitlines(keepends=True)
+    if len(lines) > _WHOLE_FILE_MAX_LINES:
+        regions = _conflict_regions(lines, _HUNK_CONTEXT_LINES)
+        if regions:
+            resolved = _resolve_hunks(lines, regions, file_path, feature_description)
+            if resolved is not None:
+                return resolved
+            logger.warning(
+                "  Incomplete hunk resolution for %s, sending whole file", file_path
+            )
+
+    system, user = resolve_conflict_prompt(content, file_path, feature_description)
+    resolved = claude_generate(user, system=system, timeout=120, cache=False)
+
+    match = _FILE_BLOCK_RE.search(resolved)
+    if match:
+        resolved = match.group(1)
+    else:
         resolved = _strip_code_fences(resolved)
 
+    if _CONFLICT_START_RE.search(resolved):
+        logger.warning("  Resolution still has markers, stripping locally for %s", file_path)
+        resolved = _strip_conflict_markers(resolved)
+    if _CONFLICT_MARKER_RE.search(resolved):
+        raise ValueError(f"Resolution for {file_path} still has conflict markers")
+
     return resolved
 
 
+def _conflict_regions(lines: list[str], context: int) -> list[tuple[int, int]]:
+    """Return [start, end) line ranges covering each conflict block plus
+    `context` lines either side, merging ranges that touch.
+
+    Returns [] if a block is left unterminated, so the caller sends the
+    whole file instead.
+    """
+    regions: list[tuple[int, int]] = []
+    start = None
+    for i, line in enumerate(lines):
+        if line.startswith("<<<<<<<") and start is None:
+            start = i
+        elif line.startswith(">>>>>>>") and start is not None:
+            lo = max(0, start - context)
+            hi = min(len(lines), i + 1 + context)
+            if regions and lo <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], hi)
+            else:
+                regions.append((lo, hi))
+            start = None
+    return [] if start is not None else regions
+
+
+def _resolve_hunks(
+    lines: list[str],
+    regions: list[tuple[int, int]],
+    file_path: str,
+    feature_description: str,
+) -> str | None:
+    """Resolve only the given regions and splice them back into the file.
+
+    Returns None unless Claude answered every region without leaving
+    conflict markers behind.
+    """
+    from .prompts import resolve_conflict_hunks_prompt
+
+    excerpts = ["".join(lines[start:end]) for start, end in regions]
+    system, user = resolve_conflict_hunks_prompt(
+        excerpts, file_path, feature_description
+    )
+    response = claude_generate(user, system=system, timeout=120, cache=False)
+    hunks = {int(n): text for n, text in _HUNK_BLOCK_RE.findall(response)}
+    if set(hunks) != set(range(1, len(regions) + 1)):
+        return None
+
+    out: list[str] = []
+    prev = 0
+    for n, ((start, end), excerpt) in enumerate(zip(regions, excerpts), 1):
+        out.extend(lines[prev:start])
+        text = hunks[n]
+        if _CONFLICT_START_RE.search(text):
+            text = _strip_conflict_markers(text)
+        if _CONFLICT_MARKER_RE.search(text):
+            return None
+        # Keep the excerpt's own line ending at the splice point
+        text = text.rstrip("\n")
+        if excerpt.endswith("\n") and text:
+            text += "\n"
+        out.append(text)
+        prev = end
+    out.extend(lines[prev:])
+    return "".join(out)
+
+
+def _strip_conflict_markers(text: str) -> str:
+    """Collapse leftover conflict blocks, keeping the incoming side.
+
+    The incoming side is the branch being merged in (the feature branch),
+    which the resolution prompt asks Claude to prefer on true conflicts.
+    """
+    out: list[str] = []
+    section = ""  # "", "ours", "base" (diff3), or "theirs"
+    for line in text.splitlines(keepends=True):
+        if line.startswith("<<<<<<<"):
+            section = "ours"
+        elif section and line.startswith("|||||||"):
+            section = "base"
+        elif section and line.startswith("======="):
+            section = "theirs"
+        elif section and line.startswith(">>>>>>>"):
+            section = ""
+        elif section in ("", "theirs"):
+            out.append(line)
+    return "".join(out)
+
+
 def _strip_code_fences(text: str) -> str:
     """Remove markdown code fences if Claude wraps the output."""
-    lines = text.strip().split("\n")
+    text = text.strip()
+    if not text.startswith("```") and not text.endswith("```"):
+        return text
+    lines = text.split("\n")
     if lines and lines[0].startswith("```"):
         lines = lines[1:]
     if lines and lines[-1].strip() == "```":
@@ -0,0 +1,68 @@
+"""In-process git status reads via libgit2 (pygit2), when it is installed.
+
+Each project directory gets one long-lived GitWorker, so branch and status
+queries cost no fork/exec. Mutating operations (add, commit, push, merge)
+stay on the git CLI so hooks and user config behave exactly as usual.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+try:
+    import pygit2
+except ImportError:  # Optional dependency
+    pygit2 = None
+
+logger = logging.getLogger(__name__)
+
+
+class GitWorker:
+    """Holds an open pygit2.Repository for one working directory."""
+
+    def __init__(self, cwd: str):
+        self.repo = pygit2.Repository(cwd)
+        self._lock = threading.Lock()
+
+    def current_branch(self) -> str:
+        with self._lock:
+            if self.repo.head_is_detached:
+                return "HEAD"
+            if self.repo.head_is_unborn:
+                target = self.repo.references["HEAD"].target
+                return target.removeprefix("refs/heads/")
+            return self.repo.head.shorthand
+
+    def status(self) -> tuple[tuple[str, ...], bool]:
+        """Return (conflicted paths, has_changes)."""
+        with self._lock:
+            entries = {
+                path: flags
+                for path, flags in self.repo.status().items()
+                if not flags & pygit2.GIT_STATUS_IGNORED
+            }
+        conflicted = tuple(
+            sorted(p for p, f in entries.items() if f & pygit2.GIT_STATUS_CONFLICTED)
+        )
+        return conflicted, bool(entries)
+
+
+_workers: dict[str, GitWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_worker(cwd: str) -> GitWorker | None:
+    """Return the worker for `cwd`, or None if pygit2 is unavailable or
+    `cwd` is not (yet) a git repository."""
+    if pygit2 is None:
+        return None
+    with _workers_lock:
+        worker = _workers.get(cwd)
+        if worker is None:
+            try:
+                worker = GitWorker(cwd)
+            except pygit2.GitError:
+                return None
+            _workers[cwd] = worker
+        return worker
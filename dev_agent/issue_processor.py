@@ -5,24 +5,32 @@ from __future__ import annotations
 import logging
 import os
 import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from itertools import groupby
+from typing import Callable, Iterator
 
 from .cli_bridge import (
+    CLIError,
     MergeConflictError,
     claude_code_implement,
     claude_generate,
-    gh_issue_close,
-    gh_issue_create,
+    estimate_tokens,
+    gh_issues_close_bulk,
+    gh_issues_create_bulk,
     gh_pr_create,
-    gh_pr_diff,
+    gh_pr_diff_sections,
     gh_pr_edit,
     gh_pr_merge,
     gh_pr_view,
     git,
     git_add_all,
+    git_add_commit_push,
     git_checkout,
     git_commit,
-    git_diff_branch,
-    git_has_changes,
+    git_current_branch,
+    git_diff_branch_sections,
     git_merge,
     git_push,
 )
@@ -32,6 +40,7 @@ from .prompts import (
     fix_failing_tests_prompt,
     format_issue_body,
     generate_phase_pr_body_prompt,
+    generate_pr_body_and_review_prompt,
     generate_pr_body_prompt,
     implement_issue_prompt,
     review_pr_prompt,
@@ -40,26 +49,179 @@ from .state import AgentState, IssueState, StepStatus
 
 logger = logging.getLogger(__name__)
 
+# Byte table: ASCII letters and digits map to themselves, every other byte
+# (including each byte of a UTF-8 multi-byte character) to "-"
+_SLUG_TABLE = bytes(
+    c if c < 128 and chr(c).isalnum() else ord("-") for c in range(256)
+)
+# Heading patterns match whole lines of the raw body (leading spaces allowed)
+_TEST_PLAN_HEADER_RE = re.compile(
+    r"^[ \t]*#{1,3}[ \t]+Test Plan", re.IGNORECASE | re.MULTILINE
+)
+_HEADING_RE = re.compile(r"^[ \t]*#{1,3}[ \t]+\S", re.MULTILINE)
+_CHECKBOX_ITEM_RE = re.compile(r"^-\s*\[[ x]\]\s*(.+)")
+_CHECKBOX_LINE_RE = re.compile(r"^(-\s*)\[[ x]\]\s*(.+)")
+_ANNOTATION_RE = re.compile(r"\s*\*\*\[(FAILED|SKIPPED):.*?\]\*\*$")
+_RESULT_LINE_RE = re.compile(
+    r"^[ \t]*(\d+)\.[ \t]*(PASS|FAIL|SKIP)[ \t]*\|[ \t]*(.+?)"
+    r"(?:[ \t]*\|[ \t]*(.+?))?[ \t]*$",
+    re.MULTILINE,
+)
+
 
 def slugify(title: str) -> str:
     """Convert issue title to a branch-name-safe slug."""
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", title.lower()).strip("-")
-    return slug[:50]
+    mapped = title.lower().encode("utf-8", "surrogatepass").translate(_SLUG_TABLE)
+    # Splitting on "-" collapses runs of dashes and trims both ends
+    return b"-".join(filter(None, mapped.split(b"-")))[:50].decode("ascii")
+
+
+# Directories never listed in the files summary (nor any dot-directory)
+_SKIP_DIRS = frozenset({
+    ".git", "node_modules", "__pycache__", "venv", ".venv",
+    "dist", "build", ".next", "state",
+})
 
 
 def get_existing_files_summary(project_dir: str) -> str:
     """Walk the project dir and return a file listing for context."""
-    skip_dirs = {
-        ".git", "node_modules", "__pycache__", "venv", ".venv",
-        "dist", "build", ".next", "state",
-    }
-    files: list[str] = []
-    for root, dirs, filenames in os.walk(project_dir):
-        dirs[:] = [d for d in dirs if d not in skip_dirs and not d.startswith(".")]
-        for fname in filenames:
-            rel_path = os.path.relpath(os.path.join(root, fname), project_dir)
-            files.append(rel_path)
-    return "\n".join(f"- {f}" for f in sorted(files))
+    # The shared "- " prefix leaves the sort order unchanged
+    lines = ["- " + f for f in _walk_project_files(project_dir)]
+    lines.sort()
+    return "\n".join(lines)
+
+
+def _walk_project_files(project_dir: str) -> set[str]:
+    """Walk the project dir and return every listed file's relative path."""
+    files: set[str] = set()
+    # Track relative paths alongside absolute ones so no relpath is needed;
+    # DirEntry type checks use cached d_type instead of extra stat calls.
+    stack = [(project_dir, "")]
+    while stack:
+        abs_dir, rel_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir():
+                    # Like os.walk, never descend into symlinked directories
+                    if (
+                        name not in _SKIP_DIRS
+                        and not name.startswith(".")
+                        and not entry.is_symlink()
+                    ):
+                        stack.append((entry.path, rel_dir + name + "/"))
+                elif name != ".git":
+                    # In a worktree .git is a file pointing at the main repo
+                    files.add(rel_dir + name)
+    return files
+
+
+# Diff budget per prompt, in estimated tokens (about 15-20KB of diff text)
+_DIFF_TOKEN_BUDGET = 5000
+
+
+def _truncate_diff_for_prompt(
+    sections: Iterator[str], token_budget: int = _DIFF_TOKEN_BUDGET
+) -> str:
+    """Join whole per-file diff sections until the token budget is spent.
+
+    A first section that alone exceeds the budget is cut at a line
+    boundary. Files left out are counted and noted at the end.
+    """
+    kept: list[str] = []
+    remaining = token_budget
+    full = False
+    omitted = 0
+    for section in sections:
+        if full:
+            omitted += 1
+            continue
+        cost = estimate_tokens(section)
+        if cost <= remaining:
+            kept.append(section)
+            remaining -= cost
+            continue
+        full = True
+        if kept:
+            omitted = 1
+        else:
+            cut = section.rfind("\n", 0, remaining * 3)
+            kept.append(section[:cut + 1] if cut > 0 else section[:remaining * 3])
+            kept.append("... [rest of this file truncated]\n")
+    text = "".join(kept)
+    if omitted:
+        text += f"... [{omitted} more file(s) truncated]"
+    return text.rstrip("\n")
+
+
+# Diffs below this size are approved without a model review
+_TRIVIAL_DIFF_CHARS = 500
+# Files whose changes alone never warrant a model review
+_SAFE_PATH_GLOBS = (
+    "*.md", "*.rst", "*.txt", "docs/*", "LICENSE*",
+    "tests/*", "test/*", "*/tests/*", "test_*.py", "*/test_*.py", "*_test.py",
+    "*.test.*", "*.spec.*",
+)
+_DIFF_FILE_RE = re.compile(r"^diff --git a/.+? b/(.+)$", re.MULTILINE)
+_AUTO_APPROVED = "APPROVED - auto (trivial diff)"
+# Trailing verdict line of the fused PR body + review response
+_REVIEW_LINE_RE = re.compile(
+    r"^\W*REVIEW\W*((?:APPROVED|CONCERNS)\b.*?)[\s*`]*$", re.IGNORECASE
+)
+
+
+def _should_auto_approve(diff_text: str) -> bool:
+    """Return True when a diff is too small or too low-risk to review.
+
+    That is: under _TRIVIAL_DIFF_CHARS, touching only docs/tests, or only
+    adding new files. A truncated diff is never auto-approved, since the
+    files left out are unknown.
+    """
+    if len(diff_text) < _TRIVIAL_DIFF_CHARS:
+        return True
+    if diff_text.endswith("truncated]"):
+        return False
+    headers = list(_DIFF_FILE_RE.finditer(diff_text))
+    if not headers:
+        return False
+    if all(
+        any(fnmatch(m.group(1), glob) for glob in _SAFE_PATH_GLOBS)
+        for m in headers
+    ):
+        return True
+    # Pure additions: every section's header says it creates the file
+    starts = [m.start() for m in headers] + [len(diff_text)]
+    return all(
+        "\nnew file mode " in diff_text[start:end].split("\n@@", 1)[0]
+        for start, end in zip(starts, starts[1:])
+    )
+
+
+def _split_review(output: str) -> tuple[str, str | None]:
+    """Split a response ending in a REVIEW line into (text before it,
+    "APPROVED|CONCERNS - ..."), or (output, None) if the line is missing."""
+    body, _, last = output.rstrip().rpartition("\n")
+    match = _REVIEW_LINE_RE.match(last.strip())
+    if not match:
+        return output, None
+    return body.rstrip(), match.group(1)
+
+
+def _test_plan_span(pr_body: str) -> tuple[int, int] | None:
+    """Return the (start, end) offsets of the Test Plan section's body.
+
+    The section runs from the line after the '# Test Plan' heading up to
+    the next heading, so nothing outside it needs to be split.
+    """
+    header = _TEST_PLAN_HEADER_RE.search(pr_body)
+    if not header:
+        return None
+    start = pr_body.find("\n", header.end())
+    if start == -1:
+        return len(pr_body), len(pr_body)
+    start += 1
+    next_heading = _HEADING_RE.search(pr_body, start)
+    return start, next_heading.start() if next_heading else len(pr_body)
 
 
 def _extract_test_items(pr_body: str) -> list[str]:
@@ -67,21 +229,15 @@ def _extract_test_items(pr_body: str) -> list[str]:
 
     Looks for the '# Test Plan' section and extracts all '- [ ]' items.
     """
-    lines = pr_body.split("\n")
-    in_test_plan = False
-    items: list[str] = []
+    span = _test_plan_span(pr_body)
+    if span is None:
+        return []
 
-    for line in lines:
-        stripped = line.strip()
-        if re.match(r"^#{1,3}\s+Test Plan", stripped, re.IGNORECASE):
-            in_test_plan = True
-            continue
-        if in_test_plan and re.match(r"^#{1,3}\s+", stripped):
-            break
-        if in_test_plan:
-            match = re.match(r"^-\s*\[[ x]\]\s*(.+)", stripped)
-            if match:
-                items.append(match.group(1).strip())
+    items: list[str] = []
+    for line in pr_body[span[0]:span[1]].splitlines():
+        match = _CHECKBOX_ITEM_RE.match(line.strip())
+        if match:
+            items.append(match.group(1).strip())
 
     return items
 
@@ -93,80 +249,67 @@ def _parse_test_results(claude_output: str) -> list[dict]:
     """
     results: list[dict] = []
 
-    match = re.search(
-        r"TEST_RESULTS_START\s*\n(.*?)\nTEST_RESULTS_END",
-        claude_output,
-        re.DOTALL,
-    )
-    if not match:
+    # Plain substring searches for the markers; no DOTALL regex over the
+    # whole (possibly long) output
+    start = claude_output.find("TEST_RESULTS_START")
+    end = -1
+    if start != -1:
+        start = claude_output.find("\n", start) + 1
+        if start:
+            end = claude_output.find("\nTEST_RESULTS_END", start)
+    if end == -1:
         logger.warning("  No TEST_RESULTS block found in Claude output")
         return results
 
-    block = match.group(1).strip()
-    for line in block.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-        line_match = re.match(
-            r"(\d+)\.\s*(PASS|FAIL|SKIP)\s*\|\s*(.+?)(?:\s*\|\s*(.+))?$",
-            line,
-        )
-        if line_match:
-            results.append({
-                "number": int(line_match.group(1)),
-                "status": line_match.group(2),
-                "description": line_match.group(3).strip(),
-                "reason": (line_match.group(4) or "").strip(),
-            })
-        else:
-            logger.warning("  Could not parse test result line: %s", line)
+    for line_match in _RESULT_LINE_RE.finditer(claude_output, start, end):
+        results.append({
+            "number": int(line_match.group(1)),
+            "status": line_match.group(2),
+            "description": line_match.group(3).strip(),
+            "reason": (line_match.group(4) or "").strip(),
+        })
+    if not results:
+        logger.warning("  TEST_RESULTS block contained no parseable lines")
 
     return results
 
 
-def _update_pr_body_with_results(
-    pr_body: str,
-    test_items: list[str],
-    results: list[dict],
-) -> str:
-    """Update PR body checkboxes based on test results."""
-    status_map: dict[str, dict] = {}
-    for r in results:
-        idx = r["number"] - 1
-        if 0 <= idx < len(test_items):
-            status_map[test_items[idx]] = r
-
-    lines = pr_body.split("\n")
-    updated_lines: list[str] = []
-
-    for line in lines:
-        stripped = line.strip()
-        match = re.match(r"^(-\s*)\[[ x]\]\s*(.+)", stripped)
-        if match:
-            prefix = match.group(1)
-            item_text = match.group(2).strip()
-            # Strip any previous annotations before matching
-            clean_text = re.sub(r"\s*\*\*\[(FAILED|SKIPPED):.*?\]\*\*$", "", item_text).strip()
-            result = status_map.get(clean_text)
-            if result:
-                if result["status"] == "PASS":
-                    updated_lines.append(f"{prefix}[x] {clean_text}")
-                elif result["status"] == "FAIL":
-                    updated_lines.append(
-                        f"{prefix}[ ] {clean_text} **[FAILED: {result['reason']}]**"
-                    )
-                elif result["status"] == "SKIP":
-                    updated_lines.append(
-                        f"{prefix}[ ] {clean_text} **[SKIPPED: {result['reason']}]**"
-                    )
-                else:
-                    updated_lines.append(line)
-            else:
-                updated_lines.append(line)
-        else:
-            updated_lines.append(line)
+def _apply_test_results(pr_body: str, results: list[dict]) -> str:
+    """Update the Test Plan checkboxes in the PR body in a single pass.
 
-    return "\n".join(updated_lines)
+    Result N is applied to the Nth checkbox item of the Test Plan section,
+    the same numbering _extract_test_items hands to the test prompt.
+    """
+    if not results:
+        return pr_body
+    span = _test_plan_span(pr_body)
+    if span is None:
+        return pr_body
+
+    by_number = {r["number"]: r for r in results}
+    lines = pr_body[span[0]:span[1]].split("\n")
+    item_number = 0
+
+    for i, line in enumerate(lines):
+        match = _CHECKBOX_LINE_RE.match(line.strip())
+        if not match:
+            continue
+        item_number += 1
+        result = by_number.get(item_number)
+        if not result:
+            continue
+
+        prefix = match.group(1)
+        # Strip any previous annotations before rewriting
+        clean_text = _ANNOTATION_RE.sub("", match.group(2).strip()).strip()
+        if result["status"] == "PASS":
+            lines[i] = f"{prefix}[x] {clean_text}"
+        elif result["status"] == "FAIL":
+            lines[i] = f"{prefix}[ ] {clean_text} **[FAILED: {result['reason']}]**"
+        elif result["status"] == "SKIP":
+            lines[i] = f"{prefix}[ ] {clean_text} **[SKIPPED: {result['reason']}]**"
+
+    return pr_body[:span[0]] + "\n".join(lines) + pr_body[span[1]:]
 
 
 def process_all_issues(
@@ -175,47 +318,261 @@ def process_all_issues(
     plan_content: str,
     state_path: str,
     max_retries: int = 2,
+    max_workers: int = 4,
+    max_conflict_workers: int = 4,
 ) -> None:
-    """Main loop: process every issue in order, grouped by phase."""
-    phases_in_order = sorted(set(iss["phase"] for iss in issues_data))
+    """Main loop: process issues grouped by phase.
+
+    Within a phase, issues whose dependencies are satisfied run concurrently
+    (up to `max_workers`), each in its own git worktree. The phase merge to
+    main runs after all of them finish. Merge conflicts are resolved up to
+    `max_conflict_workers` files at a time.
+    """
     cwd = state.project_dir
 
-    for phase_num in phases_in_order:
+    _create_pending_issues(state, issues_data, state_path, cwd)
+
+    # One stable sort groups issues by phase while keeping their order
+    by_phase = sorted(enumerate(issues_data), key=lambda p: p[1]["phase"])
+
+    for phase_num, group in groupby(by_phase, key=lambda p: p[1]["phase"]):
         logger.info("\n" + "=" * 60)
         logger.info("  Phase %d", phase_num)
         logger.info("=" * 60)
 
-        phase_issues = [
-            (i, iss)
-            for i, iss in enumerate(issues_data)
-            if iss["phase"] == phase_num
-        ]
-
-        for idx, issue_data in phase_issues:
-            issue_state = state.issues[idx]
-
-            if issue_state.sub_step == "issue_closed":
+        phase_issues = []
+        for idx, issue_data in group:
+            if state.issues[idx].sub_step == "issue_closed":
                 logger.info("Skipping completed issue: %s", issue_data["title"])
                 continue
+            phase_issues.append((idx, issue_data))
+
+        _run_dependency_graph(
+            phase_issues,
+            lambda idx, issue_data: _process_issue_worker(
+                state, idx, issue_data, len(issues_data),
+                plan_content, state_path, cwd, max_retries, max_conflict_workers,
+            ),
+            max_workers,
+        )
 
-            logger.info(
-                "\nProcessing issue %d/%d: %s",
-                idx + 1, len(issues_data), issue_data["title"],
-            )
-            issue_state.status = StepStatus.IN_PROGRESS
-            state.save(state_path)
+        # Step 9 for the whole phase: close every merged issue in one batch
+        _close_merged_issues(state, phase_issues, state_path, cwd)
+        _sync_staging(cwd)
 
-            _process_single_issue(
-                state, issue_state, issue_data, plan_content,
-                state_path, cwd, max_retries,
+        # Phase complete — merge staging into main
+        if phase_num not in state.phases_merged:
+            _merge_phase_to_main(
+                state, phase_num, state_path, cwd, issues_data, max_conflict_workers
             )
 
-            issue_state.status = StepStatus.COMPLETED
-            state.save(state_path)
 
-        # Phase complete — merge staging into main
-        if phase_num not in state.phases_merged:
-            _merge_phase_to_main(state, phase_num, state_path, cwd, issues_data)
+def _run_dependency_graph(
+    phase_issues: list[tuple[int, dict]],
+    run_issue: Callable[[int, dict], None],
+    max_workers: int,
+) -> None:
+    """Run a phase's pending issues on a thread pool in dependency order.
+
+    Each issue starts as soon as its last same-phase dependency finishes,
+    rather than waiting for a whole wave. Dependencies outside the pending
+    set are already satisfied. If only a cycle is left, its issues are all
+    started together, in input order.
+    """
+    pending_titles = {iss["title"] for _, iss in phase_issues}
+    done: set[str] = set()
+    waiting = list(phase_issues)
+    running: dict[Future, str] = {}
+
+    workers = max(1, min(max_workers, len(phase_issues)))
+    ex = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while waiting or running:
+            ready = [
+                (idx, iss)
+                for idx, iss in waiting
+                if all(
+                    d in done or d not in pending_titles
+                    for d in iss.get("dependencies", [])
+                )
+            ]
+            if not ready and not running:
+                ready = waiting
+            ready_idx = {idx for idx, _ in ready}
+            waiting = [(idx, iss) for idx, iss in waiting if idx not in ready_idx]
+            for idx, iss in ready:
+                running[ex.submit(run_issue, idx, iss)] = iss["title"]
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done.add(running.pop(future))
+                future.result()
+    except BaseException:
+        # Don't sit out the other running issues (minutes of Claude work
+        # each) before the error or Ctrl-C surfaces
+        ex.shutdown(wait=False, cancel_futures=True)
+        raise
+    ex.shutdown()
+
+
+def _close_merged_issues(
+    state: AgentState,
+    phase_issues: list[tuple[int, dict]],
+    state_path: str,
+    cwd: str,
+) -> None:
+    """Close the phase's merged issues with one batched GitHub call."""
+    merged = [
+        state.issues[idx]
+        for idx, _ in phase_issues
+        if state.issues[idx].sub_step == "pr_merged"
+    ]
+    if not merged:
+        return
+    gh_issues_close_bulk(
+        [
+            (iss.github_issue_number, f"Implemented and merged via PR #{iss.pr_number}")
+            for iss in merged
+        ],
+        cwd,
+    )
+    for iss in merged:
+        iss.sub_step = "issue_closed"
+    state.save(state_path)
+    logger.info(
+        "  Closed issues %s",
+        ", ".join(f"#{iss.github_issue_number}" for iss in merged),
+    )
+
+
+def _sync_staging(cwd: str) -> None:
+    """Check out staging in the main checkout and pull it from origin."""
+    with _repo_lock:
+        git_checkout("staging", cwd)
+        try:
+            git(["pull", "origin", "staging"], cwd)
+        except Exception:
+            pass  # Remote may not be ahead
+
+
+def _process_issue_worker(
+    state: AgentState,
+    idx: int,
+    issue_data: dict,
+    total: int,
+    plan_content: str,
+    state_path: str,
+    cwd: str,
+    max_retries: int,
+    max_conflict_workers: int,
+) -> None:
+    """Thread entry point: run one issue and record its status."""
+    issue_state = state.issues[idx]
+    logger.info("\nProcessing issue %d/%d: %s", idx + 1, total, issue_data["title"])
+    issue_state.status = StepStatus.IN_PROGRESS
+    state.append_delta(state_path, issue_state)
+
+    _process_single_issue(
+        state, issue_state, issue_data, plan_content,
+        state_path, cwd, max_retries, max_conflict_workers,
+    )
+
+    issue_state.status = StepStatus.COMPLETED
+    state.append_delta(state_path, issue_state)
+
+
+# Guards the main checkout (on staging), which all issue threads share for
+# pulls, branch creation, worktree bookkeeping and merges.
+_repo_lock = threading.RLock()
+
+
+def _worktree_path(cwd: str, issue_state: IssueState) -> str:
+    """Per-issue worktree location, outside the project so `git add -A` in
+    the main checkout never picks it up."""
+    return os.path.join(
+        cwd.rstrip(os.sep) + "-worktrees",
+        f"issue-{issue_state.github_issue_number}",
+    )
+
+
+def _ensure_worktree(cwd: str, issue_state: IssueState) -> str:
+    """Return the issue's worktree, recreating it after a resume if needed."""
+    wt = _worktree_path(cwd, issue_state)
+    if os.path.isdir(wt):
+        return wt
+    with _repo_lock:
+        git(["worktree", "prune"], cwd)
+        # A branch can only be checked out in one worktree at a time
+        if git_current_branch(cwd) == issue_state.branch_name:
+            git_checkout("staging", cwd)
+        git(["worktree", "add", wt, issue_state.branch_name], cwd)
+    return wt
+
+
+def _remove_worktree(cwd: str, issue_state: IssueState) -> None:
+    wt = _worktree_path(cwd, issue_state)
+    with _repo_lock:
+        if os.path.isdir(wt):
+            git(["worktree", "remove", "--force", wt], cwd)
+        git(["worktree", "prune"], cwd)
+
+
+# Issues per createIssue mutation. Each issue GitHub reports as created is
+# recorded at once, even when others in its batch fail, so a resume never
+# creates it twice.
+_ISSUE_BATCH_SIZE = 20
+
+
+def _create_pending_issues(
+    state: AgentState,
+    issues_data: list[dict],
+    state_path: str,
+    cwd: str,
+) -> None:
+    """Create all not-yet-created GitHub issues up front, in bulk.
+
+    Issues a batch fails to create are left for step 1 of their own
+    pipeline, which retries them one at a time.
+    """
+    pending = [
+        issue_state
+        for issue_state in state.issues
+        if not issue_state.past_step("issue_created")
+    ]
+    if not pending:
+        return
+
+    logger.info("Creating %d GitHub issues...", len(pending))
+    for start in range(0, len(pending), _ISSUE_BATCH_SIZE):
+        batch = pending[start:start + _ISSUE_BATCH_SIZE]
+        try:
+            numbers = gh_issues_create_bulk(
+                [
+                    (issues_data[iss.index]["title"], format_issue_body(issues_data[iss.index]))
+                    for iss in batch
+                ],
+                cwd=cwd,
+            )
+        except CLIError as e:
+            logger.warning("  Batch issue creation failed, will retry per issue: %s", e)
+            continue
+        failed = []
+        for issue_state, number in zip(batch, numbers):
+            if number is None:
+                failed.append(issue_state.title)
+                continue
+            issue_state.github_issue_number = number
+            issue_state.sub_step = "issue_created"
+            state.append_delta(state_path, issue_state)
+        created = [n for n in numbers if n is not None]
+        if created:
+            logger.info("  Created GitHub issues #%d-#%d", created[0], created[-1])
+        if failed:
+            logger.warning(
+                "  Could not create %d issues, will retry per issue: %s",
+                len(failed),
+                ", ".join(failed),
+            )
 
 
 def _process_single_issue(
@@ -226,18 +583,24 @@ def _process_single_issue(
     state_path: str,
     cwd: str,
     max_retries: int,
+    max_conflict_workers: int,
 ) -> None:
     """Process one issue through all sub-steps. Resumes from last completed sub_step."""
+    issue_body = format_issue_body(issue_data)
 
-    # Step 1: Create GitHub issue (no labels — they may not exist on the repo)
+    # Step 1: Create GitHub issue, if the bulk pass in _create_pending_issues
+    # could not (no labels — they may not exist on the repo)
     if not issue_state.past_step("issue_created"):
-        body = format_issue_body(issue_data)
-        issue_number = gh_issue_create(
-            title=issue_data["title"], body=body, labels=[], cwd=cwd,
+        [issue_number] = gh_issues_create_bulk(
+            [(issue_data["title"], issue_body)], cwd=cwd
         )
+        if issue_number is None:
+            raise CLIError(
+                "gh api graphql", 0, f"Could not create issue: {issue_data['title']}"
+            )
         issue_state.github_issue_number = issue_number
         issue_state.sub_step = "issue_created"
-        state.save(state_path)
+        state.append_delta(state_path, issue_state)
         logger.info("  Created GitHub issue #%d", issue_number)
 
     # Step 2: Create feature branch from staging
@@ -246,25 +609,26 @@ def _process_single_issue(
         branch_name = f"feature/issue-{issue_state.github_issue_number}-{slug}"
         issue_state.branch_name = branch_name
 
-        git_checkout("staging", cwd)
-        try:
-            git(["pull", "origin", "staging"], cwd)
-        except Exception:
-            pass  # Remote may not be ahead
+        with _repo_lock:
+            _sync_staging(cwd)
 
-        git_checkout(branch_name, cwd, create=True)
+            # Branch off staging into the issue's own worktree
+            git([
+                "worktree", "add", "-b", branch_name,
+                _worktree_path(cwd, issue_state), "staging",
+            ], cwd)
 
         issue_state.sub_step = "branch_created"
-        state.save(state_path)
-        logger.info("  Created branch: %s", branch_name)
+        state.append_delta(state_path, issue_state)
+        logger.debug("  Created branch: %s", branch_name)
 
     # Step 3: Generate code with Claude Code
     if not issue_state.past_step("code_generated"):
-        git_checkout(issue_state.branch_name, cwd)
-        files_summary = get_existing_files_summary(cwd)
-        prompt = implement_issue_prompt(
+        wt = _ensure_worktree(cwd, issue_state)
+        files_summary = get_existing_files_summary(wt)
+        system, prompt = implement_issue_prompt(
             issue_title=issue_data["title"],
-            issue_body=format_issue_body(issue_data),
+            issue_body=issue_body,
             plan_context=plan_content,
             existing_files_summary=files_summary,
         )
@@ -272,7 +636,7 @@ def _process_single_issue(
         last_error = None
         for attempt in range(max_retries + 1):
             try:
-                claude_code_implement(prompt, cwd=cwd, timeout=600)
+                claude_code_implement(prompt, cwd=wt, timeout=600, system=system)
                 break
             except Exception as e:
                 last_error = e
@@ -285,43 +649,57 @@ def _process_single_issue(
                     raise last_error
 
         issue_state.sub_step = "code_generated"
-        state.save(state_path)
-        logger.info("  Code generated")
+        state.append_delta(state_path, issue_state)
+        logger.debug("  Code generated")
 
     # Step 4: Commit and push
     if not issue_state.past_step("committed"):
-        git_checkout(issue_state.branch_name, cwd)
-        if git_has_changes(cwd):
-            git_add_all(cwd)
-            git_commit(
-                f"Implement: {issue_data['title']}\n\n"
-                f"Closes #{issue_state.github_issue_number}",
-                cwd,
-            )
-        else:
+        wt = _ensure_worktree(cwd, issue_state)
+        committed = git_add_commit_push(
+            f"Implement: {issue_data['title']}\n\n"
+            f"Closes #{issue_state.github_issue_number}",
+            wt,
+            issue_state.branch_name,
+            set_upstream=True,
+        )
+        if not committed:
             logger.warning("  No changes detected after code generation")
-
-        git_push(cwd, issue_state.branch_name, set_upstream=True)
+            git_push(wt, issue_state.branch_name, set_upstream=True)
 
         issue_state.sub_step = "committed"
-        state.save(state_path)
-        logger.info("  Changes committed and pushed")
+        state.append_delta(state_path, issue_state)
+        logger.debug("  Changes committed and pushed")
 
     # Step 5: Create PR with Claude-generated description
+    diff_text: str | None = None
+    review: str | None = None
     if not issue_state.past_step("pr_created"):
-        diff_text = git_diff_branch("staging", issue_state.branch_name, cwd)
-
-        # Truncate large diffs to fit prompt limits
-        if len(diff_text) > 15000:
-            diff_text = diff_text[:15000] + "\n... [truncated]"
+        diff_text = _truncate_diff_for_prompt(
+            git_diff_branch_sections("staging", issue_state.branch_name, cwd)
+        )
 
-        issue_body = format_issue_body(issue_data)
-        pr_body_prompt = generate_pr_body_prompt(
+        # Unless the diff is trivial, the review (step 6) comes from the
+        # same call as the PR body, so the diff is sent only once.
+        if _should_auto_approve(diff_text):
+            review = _AUTO_APPROVED
+            build_prompt = generate_pr_body_prompt
+        else:
+            build_prompt = generate_pr_body_and_review_prompt
+        system, pr_body_prompt = build_prompt(
             issue_title=issue_data["title"],
             issue_body=issue_body,
             diff_text=diff_text,
         )
-        pr_body = claude_generate(pr_body_prompt, cwd=cwd, timeout=120)
+        pr_body = claude_generate(
+            pr_body_prompt,
+            cwd=cwd,
+            timeout=120,
+            system=system,
+            fast=True,
+            cache=False,
+        )
+        if review is None:
+            pr_body, review = _split_review(pr_body)
 
         # Prepend the issue reference
         pr_body = f"Implements #{issue_state.github_issue_number}\n\n{pr_body}"
@@ -335,33 +713,41 @@ def _process_single_issue(
         )
         issue_state.pr_number = pr_number
         issue_state.sub_step = "pr_created"
-        state.save(state_path)
+        state.append_delta(state_path, issue_state)
         logger.info("  Created PR #%d", pr_number)
 
     # Step 6: Auto-review the PR
     if not issue_state.past_step("pr_reviewed"):
-        diff_text = gh_pr_diff(issue_state.pr_number, cwd)
-
-        # Truncate large diffs to fit prompt limits
-        if len(diff_text) > 15000:
-            diff_text = diff_text[:15000] + "\n... [truncated]"
-
-        review = claude_generate(
-            review_pr_prompt(diff_text, issue_data["title"]),
-            timeout=120,
-        )
+        if review is None:
+            if diff_text is None:
+                # Resumed after step 5: review the PR's diff as GitHub sees it
+                diff_text = _truncate_diff_for_prompt(
+                    gh_pr_diff_sections(issue_state.pr_number, cwd)
+                )
+            if _should_auto_approve(diff_text):
+                review = _AUTO_APPROVED
+            else:
+                output = claude_generate(
+                    review_pr_prompt(diff_text, issue_data["title"]),
+                    timeout=120,
+                    fast=True,
+                    cache=False,
+                )
+                review = _split_review(output)[1] or output.strip()
         logger.info("  Review: %s", review)
 
-        if review.strip().upper().startswith("CONCERNS"):
+        if review.upper().startswith("CONCERNS"):
             logger.warning("  PR review flagged concerns — proceeding anyway")
 
         issue_state.sub_step = "pr_reviewed"
-        state.save(state_path)
+        state.append_delta(state_path, issue_state)
 
     # Step 7: Execute test plan
     if not issue_state.past_step("tests_passed"):
-        git_checkout(issue_state.branch_name, cwd)
+        wt = _ensure_worktree(cwd, issue_state)
 
+        # One fetch per step; afterwards we are the only writer of the body,
+        # so retries reuse the copy we last wrote instead of re-fetching.
         pr_body = gh_pr_view(issue_state.pr_number, cwd)
         test_items = _extract_test_items(pr_body)
 
@@ -370,18 +756,19 @@ def _process_single_issue(
         else:
             logger.info("  Found %d test plan items, executing...", len(test_items))
 
-            for attempt in range(max_retries + 1):
-                test_prompt = execute_test_plan_prompt(
-                    test_items=test_items,
-                    project_description=(
-                        f"{issue_data['title']}: {issue_data.get('description', '')}"
-                    ),
-                    tech_stack=state.tech_stack,
-                )
+            project_description = (
+                f"{issue_data['title']}: {issue_data.get('description', '')}"
+            )
+            test_prompt = execute_test_plan_prompt(
+                test_items=test_items,
+                project_description=project_description,
+                tech_stack=state.tech_stack,
+            )
 
+            for attempt in range(max_retries + 1):
                 try:
                     test_output = claude_code_implement(
-                        test_prompt, cwd=cwd, timeout=1800,
+                        test_prompt, cwd=wt, timeout=1800,
                     )
                 except Exception as e:
                     logger.error("  Test execution failed with error: %s", e)
@@ -409,9 +796,8 @@ def _process_single_issue(
                 )
 
                 # Update PR body with results
-                pr_body = gh_pr_view(issue_state.pr_number, cwd)
-                updated_body = _update_pr_body_with_results(pr_body, test_items, results)
-                gh_pr_edit(issue_state.pr_number, cwd, updated_body)
+                pr_body = _apply_test_results(pr_body, results)
+                gh_pr_edit(issue_state.pr_number, cwd, pr_body)
                 logger.info("  Updated PR body with test results")
 
                 if not failed:
@@ -429,25 +815,21 @@ def _process_single_issue(
                             {"description": r["description"], "reason": r["reason"]}
                             for r in failed
                         ],
-                        project_description=(
-                            f"{issue_data['title']}: {issue_data.get('description', '')}"
-                        ),
+                        project_description=project_description,
                         tech_stack=state.tech_stack,
                     )
 
                     try:
-                        claude_code_implement(fix_prompt, cwd=cwd, timeout=600)
+                        claude_code_implement(fix_prompt, cwd=wt, timeout=600)
                     except Exception as e:
                         logger.error("  Fix attempt failed: %s", e)
 
-                    if git_has_changes(cwd):
-                        git_add_all(cwd)
-                        git_commit(
-                            f"Fix failing tests (attempt {attempt + 1}): "
-                            f"{issue_data['title']}",
-                            cwd,
-                        )
-                        git_push(cwd, issue_state.branch_name)
+                    if git_add_commit_push(
+                        f"Fix failing tests (attempt {attempt + 1}): "
+                        f"{issue_data['title']}",
+                        wt,
+                        issue_state.branch_name,
+                    ):
                         logger.info("  Fix committed and pushed")
                     else:
                         logger.warning("  No changes after fix attempt")
@@ -458,41 +840,31 @@ def _process_single_issue(
                     )
 
         issue_state.sub_step = "tests_passed"
-        state.save(state_path)
+        state.append_delta(state_path, issue_state)
 
-    # Step 8: Merge PR (only after tests pass)
+    # Step 8: Merge PR (only after tests pass). Merges are serialized on the
+    # main checkout; the worktree goes first so the branch can be deleted.
     if not issue_state.past_step("pr_merged"):
-        try:
-            gh_pr_merge(
-                issue_state.pr_number, cwd,
-                squash=True, delete_branch=True,
-            )
-        except Exception as e:
-            logger.warning("  gh pr merge failed: %s — attempting manual merge", e)
-            _manual_merge_to_staging(state, issue_state, issue_data, cwd, state_path)
-
-        # Update local staging to match remote
-        git_checkout("staging", cwd)
-        try:
-            git(["pull", "origin", "staging"], cwd)
-        except Exception:
-            pass
+        _remove_worktree(cwd, issue_state)
+        with _repo_lock:
+            try:
+                gh_pr_merge(
+                    issue_state.pr_number, cwd,
+                    squash=True, delete_branch=True,
+                )
+            except Exception as e:
+                logger.warning("  gh pr merge failed: %s — attempting manual merge", e)
+                _manual_merge_to_staging(
+                    state, issue_state, issue_data, cwd, state_path,
+                    max_conflict_workers,
+                )
 
+        # Local staging is not pulled here: the next branch creation pulls
+        # it anyway, and the phase end syncs it once (_sync_staging).
         issue_state.sub_step = "pr_merged"
-        state.save(state_path)
+        state.append_delta(state_path, issue_state)
         logger.info("  PR merged into staging")
 
-    # Step 9: Close issue
-    if not issue_state.past_step("issue_closed"):
-        gh_issue_close(
-            issue_state.github_issue_number,
-            cwd,
-            comment=f"Implemented and merged via PR #{issue_state.pr_number}",
-        )
-        issue_state.sub_step = "issue_closed"
-        state.save(state_path)
-        logger.info("  Issue #%d closed", issue_state.github_issue_number)
-
 
 def _manual_merge_to_staging(
     state: AgentState,
@@ -500,6 +872,7 @@ def _manual_merge_to_staging(
     issue_data: dict,
     cwd: str,
     state_path: str,
+    max_conflict_workers: int,
 ) -> None:
     """Fallback: merge feature branch into staging locally, handling conflicts."""
     git_checkout("staging", cwd)
@@ -512,7 +885,11 @@ def _manual_merge_to_staging(
         git_merge(issue_state.branch_name, cwd)
     except MergeConflictError:
         logger.warning("  Merge conflicts detected, resolving with Claude...")
-        resolve_conflicts(cwd=cwd, feature_description=issue_data["title"])
+        resolve_conflicts(
+            cwd=cwd,
+            feature_description=issue_data["title"],
+            max_workers=max_conflict_workers,
+        )
         git_add_all(cwd)
         git_commit(
             f"Merge {issue_state.branch_name} into staging (conflicts resolved)\n\n"
@@ -529,14 +906,15 @@ def _merge_phase_to_main(
     state_path: str,
     cwd: str,
     issues_data: list[dict] | None = None,
+    max_conflict_workers: int = 4,
 ) -> None:
     """After all issues in a phase complete, merge staging -> main via PR."""
     logger.info("\n  Merging Phase %d: staging -> main", phase_num)
 
     # Generate a proper PR body using Claude
-    diff_text = git_diff_branch("main", "staging", cwd)
-    if len(diff_text) > 15000:
-        diff_text = diff_text[:15000] + "\n... [truncated]"
+    diff_text = _truncate_diff_for_prompt(
+        git_diff_branch_sections("main", "staging", cwd)
+    )
 
     phase_issues = []
     if issues_data:
@@ -562,16 +940,13 @@ def _merge_phase_to_main(
     gh_pr_merge(pr_number, cwd, squash=False, delete_branch=False)
     logger.info("  Phase %d PR merged", phase_num)
 
-    # Sync local branches
-    git_checkout("main", cwd)
-    try:
-        git(["pull", "origin", "main"], cwd)
-    except Exception:
-        pass
-
+    # Sync local branches with one fetch. main is never checked out here, so
+    # the main:main refspec fast-forwards it without a checkout; staging
+    # (the current branch) is fast-forwarded from its remote-tracking ref.
     git_checkout("staging", cwd)
     try:
-        git(["pull", "origin", "staging"], cwd)
+        git(["fetch", "origin", "main:main", "staging"], cwd)
+        git(["merge", "--ff-only", "origin/staging"], cwd)
     except Exception:
         pass
 
@@ -579,7 +954,11 @@ def _merge_phase_to_main(
     try:
         git_merge("main", cwd)
     except MergeConflictError:
-        resolve_conflicts(cwd=cwd, feature_description=f"Phase {phase_num} sync")
+        resolve_conflicts(
+            cwd=cwd,
+            feature_description=f"Phase {phase_num} sync",
+            max_workers=max_conflict_workers,
+        )
         git_add_all(cwd)
         git_commit("Sync staging with main after phase merge", cwd)
 
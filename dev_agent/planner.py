@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+from collections import deque
 
 from .cli_bridge import claude_generate
 from .prompts import issues_json_prompt, plan_prompt
@@ -32,8 +33,12 @@ def get_idea_from_user() -> tuple[str, str]:
     return idea, tech_stack
 
 
-def generate_plan(state: AgentState, state_path: str) -> str:
-    """Generate plan.md using Claude. Returns the plan content."""
+def generate_plan(state: AgentState) -> str:
+    """Generate the plan using Claude. Returns the plan content.
+
+    Writes nothing, so it can run while the repo is being set up;
+    save_plan() puts it on disk.
+    """
     if state.plan_generated:
         logger.info("Plan already generated, loading from disk")
         plan_path = os.path.join(state.project_dir, "plan.md")
@@ -42,24 +47,25 @@ def generate_plan(state: AgentState, state_path: str) -> str:
 
     logger.info("Generating project plan with Claude...")
     prompt = plan_prompt(state.project_idea, state.tech_stack)
-    plan_content = claude_generate(prompt)
+    return claude_generate(prompt)
+
 
-    # Write plan.md to project directory
+def save_plan(state: AgentState, state_path: str, plan_content: str) -> None:
+    """Write plan.md to the project directory and record it in state."""
     os.makedirs(state.project_dir, exist_ok=True)
     plan_path = os.path.join(state.project_dir, "plan.md")
     with open(plan_path, "w") as f:
         f.write(plan_content)
 
-    state.plan_generated = True
-    state.save(state_path)
+    state.record_delta(state_path, plan_generated=True)
     logger.info("Plan generated and saved to plan.md")
-    return plan_content
 
 
-def generate_issues_json(
-    state: AgentState, plan_content: str, state_path: str
-) -> list[dict]:
-    """Convert plan into structured issues JSON. Returns list of issue dicts."""
+def generate_issues_json(state: AgentState, plan_content: str) -> list[dict]:
+    """Convert plan into structured issues JSON. Returns list of issue dicts.
+
+    Like generate_plan(), writes nothing; save_issues_json() persists them.
+    """
     if state.issues_json_generated:
         logger.info("Issues JSON already generated, loading from disk")
         issues_path = os.path.join(state.project_dir, "issues.json")
@@ -72,12 +78,17 @@ def generate_issues_json(
 
     # Parse JSON — handle markdown fences if Claude adds them
     cleaned = raw_output.strip()
+    del raw_output
     if cleaned.startswith("```"):
-        lines = cleaned.split("\n")
-        lines = [line for line in lines if not line.strip().startswith("```")]
-        cleaned = "\n".join(lines)
+        cleaned = "\n".join(
+            line
+            for line in cleaned.split("\n")
+            if not line.strip().startswith("```")
+        )
 
     issues = json.loads(cleaned)
+    # Only the parsed list is kept for the rest of the run
+    del cleaned
 
     # Validate required fields
     for i, issue in enumerate(issues):
@@ -87,9 +98,14 @@ def generate_issues_json(
             raise ValueError(f"Issue {i} missing fields: {missing}")
 
     # Sort by phase then respect dependency order
-    issues = _topological_sort_issues(issues)
+    return _topological_sort_issues(issues)
 
-    # Persist to state
+
+def save_issues_json(
+    state: AgentState, state_path: str, issues: list[dict]
+) -> None:
+    """Write issues.json to the project directory and record the issues
+    in state."""
     state.issues = [
         IssueState(
             index=i,
@@ -108,11 +124,20 @@ def generate_issues_json(
     state.issues_json_generated = True
     state.save(state_path)
     logger.info("Generated %d issues across phases", len(issues))
-    return issues
 
 
 def _topological_sort_issues(issues: list[dict]) -> list[dict]:
-    """Sort: by phase first, then respect dependency ordering within each phase."""
+    """Sort: by phase first, then respect dependency ordering within each phase.
+
+    Kahn's algorithm per phase; ties keep input order. Dependencies on
+    issues outside the phase count as satisfied. Issues caught in a cycle
+    are appended at the end of their phase, in input order.
+    """
+    # Common case: no dependencies at all, so a stable sort by phase is
+    # exactly what Kahn's algorithm would produce
+    if not any(iss.get("dependencies") for iss in issues):
+        return sorted(issues, key=lambda iss: iss["phase"])
+
     phases: dict[int, list[dict]] = {}
     for iss in issues:
         phases.setdefault(iss["phase"], []).append(iss)
@@ -120,21 +145,33 @@ def _topological_sort_issues(issues: list[dict]) -> list[dict]:
     sorted_issues: list[dict] = []
     for phase_num in sorted(phases.keys()):
         phase_issues = phases[phase_num]
-        resolved: set[str] = set()
-        remaining = list(phase_issues)
-        max_iters = len(remaining) ** 2 + 1
-        iteration = 0
-
-        while remaining and iteration < max_iters:
-            iteration += 1
-            for iss in list(remaining):
-                deps = iss.get("dependencies", [])
-                if all(d in resolved for d in deps):
-                    sorted_issues.append(iss)
-                    resolved.add(iss["title"])
-                    remaining.remove(iss)
-
-        # Append anything left (cycle or unresolvable deps)
-        sorted_issues.extend(remaining)
+        position = {}
+        for i, iss in enumerate(phase_issues):
+            position.setdefault(iss["title"], i)
+
+        indegree = [0] * len(phase_issues)
+        dependents: list[list[int]] = [[] for _ in phase_issues]
+        for i, iss in enumerate(phase_issues):
+            for dep in set(iss.get("dependencies", [])):
+                j = position.get(dep)
+                if j is not None and j != i:
+                    indegree[i] += 1
+                    dependents[j].append(i)
+
+        queue = deque(i for i, n in enumerate(indegree) if n == 0)
+        emitted = [False] * len(phase_issues)
+        while queue:
+            i = queue.popleft()
+            emitted[i] = True
+            sorted_issues.append(phase_issues[i])
+            for k in dependents[i]:
+                indegree[k] -= 1
+                if indegree[k] == 0:
+                    queue.append(k)
+
+        # Append anything left (dependency cycle)
+        sorted_issues.extend(
+            iss for i, iss in enumerate(phase_issues) if not emitted[i]
+        )
 
     return sorted_issues
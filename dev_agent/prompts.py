@@ -1,5 +1,7 @@
 """All prompt templates used by the orchestration agent."""
 
+import functools
+
 
 def plan_prompt(idea: str, tech_stack: str) -> str:
     return f"""You are a senior software architect. Create a detailed project plan in Markdown for the following project.
@@ -106,13 +108,35 @@ Create all files now.
 """
 
 
+_IMPLEMENT_INSTRUCTIONS = """## Instructions
+1. Read the existing code to understand the current state
+2. Implement ONLY what the issue below describes — nothing more
+3. Follow existing code conventions and patterns
+4. Write clean, production-ready code
+5. Add tests if appropriate for this feature
+6. Do not modify files unrelated to this issue
+7. Make sure the project still compiles/runs after your changes
+"""
+
+
 def implement_issue_prompt(
     issue_title: str,
     issue_body: str,
     plan_context: str,
     existing_files_summary: str,
-) -> str:
-    return f"""You are implementing a specific feature for an existing project.
+) -> tuple[str, str]:
+    """Return (system, user) prompts for implementing one issue.
+
+    The system part (plan and instructions) is identical for every issue
+    in a build; the file listing and the issue itself come last.
+    """
+    system = (
+        "You are implementing a specific feature for an existing project.\n\n"
+        f"## Project Plan Context\n{plan_context}\n\n"
+        + _IMPLEMENT_INSTRUCTIONS
+    )
+    user = f"""## Existing Project Files
+{existing_files_summary}
 
 ## Issue to Implement
 **Title:** {issue_title}
@@ -120,52 +144,71 @@ def implement_issue_prompt(
 **Details:**
 {issue_body}
 
-## Project Plan Context
-{plan_context}
-
-## Existing Project Files
-{existing_files_summary}
-
-## Instructions
-1. Read the existing code to understand the current state
-2. Implement ONLY what this issue describes — nothing more
-3. Follow existing code conventions and patterns
-4. Write clean, production-ready code
-5. Add tests if appropriate for this feature
-6. Do not modify files unrelated to this issue
-7. Make sure the project still compiles/runs after your changes
-
 Implement the feature now.
 """
+    return system, user
 
 
 def format_issue_body(issue_data: dict) -> str:
-    """Format an issue dict into the GitHub issue markdown template."""
-    criteria = "\n".join(
-        f"- [ ] {c}" for c in issue_data.get("acceptance_criteria", [])
-    )
-    enhancements = "\n".join(
-        f"- {e}" for e in issue_data.get("optional_enhancements", [])
-    )
-    related = "\n".join(
-        f"- `{f}`" for f in issue_data.get("related_files", [])
+    """Format an issue dict into the GitHub issue markdown template.
+
+    Memoized on the rendered fields, frozen into hashable arguments, so the
+    same issue rendered for bulk creation and again in its own pipeline is
+    built once.
+    """
+    get = issue_data.get  # One method lookup for the dozen fields below
+    args = (
+        get("description", ""),
+        get("problem_statement", ""),
+        get("proposed_solution", ""),
+        get("technical_details", ""),
+        get("expected_outcome", ""),
+        get("phase", "N/A"),
+        get("priority", "N/A"),
+        tuple(get("acceptance_criteria", ())),
+        tuple(get("optional_enhancements", ())),
+        tuple(get("related_files", ())),
+        tuple(get("dependencies", ())),
     )
+    try:
+        return _render_issue_body(*args)
+    except TypeError:  # An unhashable field value; render uncached
+        return _render_issue_body.__wrapped__(*args)
+
+
+@functools.lru_cache(maxsize=512)
+def _render_issue_body(
+    description,
+    problem_statement,
+    proposed_solution,
+    technical_details,
+    expected_outcome,
+    phase,
+    priority,
+    acceptance_criteria: tuple,
+    optional_enhancements: tuple,
+    related_files: tuple,
+    dependencies: tuple,
+) -> str:
+    criteria = "\n".join(f"- [ ] {c}" for c in acceptance_criteria)
+    enhancements = "\n".join(f"- {e}" for e in optional_enhancements)
+    related = "\n".join(f"- `{f}`" for f in related_files)
 
     return f"""## Description
 
-{issue_data.get('description', '')}
+{description}
 
 ## Problem Statement
 
-{issue_data.get('problem_statement', '')}
+{problem_statement}
 
 ## Proposed Solution
 
-{issue_data.get('proposed_solution', '')}
+{proposed_solution}
 
 ## Technical Details
 
-{issue_data.get('technical_details', '')}
+{technical_details}
 
 ## Acceptance Criteria
 
@@ -173,7 +216,7 @@ def format_issue_body(issue_data: dict) -> str:
 
 ## Expected Outcome
 
-{issue_data.get('expected_outcome', '')}
+{expected_outcome}
 
 ## Optional Enhancements (Future Scope)
 
@@ -185,17 +228,12 @@ def format_issue_body(issue_data: dict) -> str:
 
 ## Notes / References
 
-Phase: {issue_data.get('phase', 'N/A')} | Priority: {issue_data.get('priority', 'N/A')}
-Dependencies: {', '.join(issue_data.get('dependencies', [])) or 'None'}
+Phase: {phase} | Priority: {priority}
+Dependencies: {', '.join(dependencies) or 'None'}
 """
 
 
-def generate_pr_body_prompt(
-    issue_title: str,
-    issue_body: str,
-    diff_text: str,
-) -> str:
-    return f"""You are generating a GitHub Pull Request description.
+_PR_BODY_RUBRIC = """You are generating a GitHub Pull Request description.
 
 Based on:
 1. The GitHub Issue description
@@ -260,10 +298,20 @@ Constraints:
 - Assume reviewer is technical.
 - Format must be clean GitHub-ready Markdown.
 - Output ONLY the PR description — no preamble, no explanations outside the structure.
+"""
+
 
----
+def generate_pr_body_prompt(
+    issue_title: str,
+    issue_body: str,
+    diff_text: str,
+) -> tuple[str, str]:
+    """Return (system, user) prompts for one feature PR description.
 
-## Issue Title
+    The system part is the fixed rubric, shared by every PR in a build.
+    """
+    system = _PR_BODY_RUBRIC
+    user = f"""## Issue Title
 {issue_title}
 
 ## Issue Description
@@ -275,8 +323,40 @@ Constraints:
 ```
 
 Generate the PR description now:
+"""
+    return system, user
+
+
+# Review criteria and verdict line shared by the fused and standalone
+# reviews; callers parse the final REVIEW line.
+_REVIEW_CRITERIA = (
+    "Does the diff implement what the issue asked for, without obvious bugs, "
+    "security issues, or missing error handling?"
+)
+_REVIEW_VERDICT_LINE = """exactly one line in the form:
+REVIEW: APPROVED - [brief reason]
+or
+REVIEW: CONCERNS - [specific concerns, 2-3 sentences maximum]
 """
 
+_PR_REVIEW_ADDENDUM = f"""
+Also review the diff against the issue. {_REVIEW_CRITERIA}
+
+After the PR description, end your output with {_REVIEW_VERDICT_LINE}
+That REVIEW line is the only text allowed after the PR description.
+"""
+
+
+def generate_pr_body_and_review_prompt(
+    issue_title: str,
+    issue_body: str,
+    diff_text: str,
+) -> tuple[str, str]:
+    """Return (system, user) prompts asking for the PR description followed
+    by a one-line review, so the diff is sent once for both."""
+    system, user = generate_pr_body_prompt(issue_title, issue_body, diff_text)
+    return system + _PR_REVIEW_ADDENDUM, user
+
 
 def generate_phase_pr_body_prompt(
     phase_num: int,
@@ -329,25 +409,28 @@ Generate the PR description now:
 
 
 def review_pr_prompt(diff_text: str, issue_title: str) -> str:
-    return f"""You are reviewing a pull request for the issue: "{issue_title}"
-
-Here is the diff:
+    return f"""Review this pull request for the issue: "{issue_title}"
 
 ```diff
 {diff_text}
 ```
 
-Evaluate:
-1. Does the diff implement what the issue asked for?
-2. Are there any obvious bugs, security issues, or missing error handling?
-3. Does it look like a reasonable implementation?
+{_REVIEW_CRITERIA}
+Reply with {_REVIEW_VERDICT_LINE}"""
 
-Respond with either:
-APPROVED - [brief reason]
-or
-CONCERNS - [list specific concerns]
 
-Keep your response to 2-3 sentences maximum.
+def _resolve_conflict_system(feature_description: str, output_rule: str) -> str:
+    return f"""You are resolving merge conflicts in files that contain conflict markers (<<<<<<, ======, >>>>>>).
+
+## Context
+This conflict arose while merging a feature branch into staging.
+Feature being implemented: {feature_description}
+
+## Instructions
+1. Resolve the conflict by keeping both changes where possible
+2. Prefer the feature branch changes when there is a true conflict
+3. Remove ALL conflict markers (<<<<<<, ======, >>>>>>)
+4. {output_rule} — no explanations, no markdown fences, no conflict markers
 """
 
 
@@ -355,48 +438,55 @@ def resolve_conflict_prompt(
     conflicted_file_contents: str,
     file_path: str,
     feature_description: str,
-) -> str:
-    return f"""You are resolving a merge conflict in: {file_path}
-
-The file contains merge conflict markers (<<<<<<, ======, >>>>>>).
-
-## Context
-This conflict arose while merging a feature branch into staging.
-Feature being implemented: {feature_description}
-
-## File with conflicts:
+) -> tuple[str, str]:
+    """Return (system, user) prompts for resolving one conflicted file.
+
+    The system part contains no per-file data, so it is byte-identical for
+    every file in a merge and can be served from the prompt cache.
+    """
+    system = _resolve_conflict_system(
+        feature_description,
+        "Output ONLY the final resolved file contents between <FILE> and </FILE> tags",
+    )
+    user = f"""## File with conflicts: {file_path}
 ```
 {conflicted_file_contents}
 ```
 
-## Instructions
-1. Resolve the conflict by keeping both changes where possible
-2. Prefer the feature branch changes when there is a true conflict
-3. Remove ALL conflict markers (<<<<<<, ======, >>>>>>)
-4. Output ONLY the resolved file contents — no explanations, no markdown fences
-
 Output the resolved file now:
 """
+    return system, user
 
 
-def execute_test_plan_prompt(
-    test_items: list[str],
-    project_description: str,
-    tech_stack: str,
-) -> str:
-    numbered_items = "\n".join(f"{i+1}. {item}" for i, item in enumerate(test_items))
-    return f"""You are a QA engineer executing a test plan for a project.
+def resolve_conflict_hunks_prompt(
+    excerpts: list[str],
+    file_path: str,
+    feature_description: str,
+) -> tuple[str, str]:
+    """Return (system, user) prompts for resolving only the conflicted
+    regions of a large file, each sent with some surrounding context."""
+    system = _resolve_conflict_system(
+        feature_description,
+        "For each numbered excerpt, output ONLY its resolved text (context "
+        "lines included) between <HUNK n> and </HUNK> tags, in order",
+    )
+    numbered = "\n".join(
+        f"<EXCERPT {n}>\n{text}</EXCERPT>"
+        for n, text in enumerate(
+            (e if e.endswith("\n") else e + "\n" for e in excerpts), 1
+        )
+    )
+    user = f"""## Conflicted excerpts from: {file_path}
+Each excerpt is one region of the file, with unchanged lines around the conflict for context.
 
-## Project
-{project_description}
+{numbered}
 
-## Tech Stack
-{tech_stack}
+Output the resolved excerpts now:
+"""
+    return system, user
 
-## Test Plan Items to Execute
-{numbered_items}
 
-## Instructions
+_TEST_EXECUTION_INSTRUCTIONS = """## Instructions
 For EACH test item above, you must actually execute it — not just describe what you would do.
 
 ### How to Test
@@ -431,6 +521,29 @@ Execute the tests now.
 """
 
 
+def execute_test_plan_prompt(
+    test_items: list[str],
+    project_description: str,
+    tech_stack: str,
+) -> str:
+    numbered_items = "\n".join(f"{i+1}. {item}" for i, item in enumerate(test_items))
+    return (
+        f"""You are a QA engineer executing a test plan for a project.
+
+## Project
+{project_description}
+
+## Tech Stack
+{tech_stack}
+
+## Test Plan Items to Execute
+{numbered_items}
+
+"""
+        + _TEST_EXECUTION_INSTRUCTIONS
+    )
+
+
 def fix_failing_tests_prompt(
     failing_tests: list[dict],
     project_description: str,
@@ -4,22 +4,28 @@ from __future__ import annotations
 
 import logging
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 from .cli_bridge import (
+    CLIError,
     claude_code_implement,
+    gh_git_remote_url,
     gh_repo_clone,
     gh_repo_create,
     git,
-    git_add_all,
     git_checkout,
-    git_commit,
     git_push,
+    git_script,
 )
 from .prompts import scaffolding_prompt
 from .state import AgentState
 
 logger = logging.getLogger(__name__)
 
+# owner/repo in the URL printed by `gh repo create`
+_GH_URL_RE = re.compile(r"github\.com/([^/\s]+/[^/\s]+)")
+
 
 def setup_repo(
     state: AgentState,
@@ -40,51 +46,85 @@ def setup_repo(
         state.repo_name = existing_repo.split("/")[-1]
         gh_repo_clone(existing_repo, project_dir)
     else:
-        # Initialize local git repo
-        if not os.path.exists(os.path.join(project_dir, ".git")):
-            git(["init"], project_dir)
-            git(["branch", "-M", "main"], project_dir)
-
-            # Create initial README
-            readme_path = os.path.join(project_dir, "README.md")
-            with open(readme_path, "w") as f:
-                f.write(f"# {state.repo_name}\n\n{state.project_idea}\n")
-
-            # Ensure state dir is always gitignored
-            gitignore_path = os.path.join(project_dir, ".gitignore")
-            gitignore_lines = []
-            if os.path.exists(gitignore_path):
-                with open(gitignore_path) as f:
-                    gitignore_lines = f.read().splitlines()
-            if "state/" not in gitignore_lines:
-                with open(gitignore_path, "a") as f:
-                    f.write("\n# Agent state\nstate/\n")
-
-            git_add_all(project_dir)
-            git_commit("Initial commit", project_dir)
-
-        # Create GitHub remote
+        # The empty GitHub repo does not depend on local content, so it is
+        # created while the local repository and first commit are made.
         description = state.project_idea[:200]
-        url = gh_repo_create(
-            state.repo_name, project_dir, private=True, description=description
-        )
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            fut_url = ex.submit(
+                gh_repo_create,
+                state.repo_name,
+                project_dir,
+                private=True,
+                description=description,
+                source=False,
+            )
+            if not _project_has_git(project_dir):
+                _init_local_repo(state, project_dir)
+            url = fut_url.result()
         logger.info("GitHub repo created: %s", url)
 
         # Parse owner/repo from the URL (first line of output)
-        # gh repo create --push can output multiple lines
         first_line = url.split("\n")[0].strip()
-        import re as _re
-        match = _re.search(r"github\.com/([^/\s]+/[^/\s]+)", first_line)
-        if match:
-            state.repo_full_name = match.group(1)
-        else:
-            state.repo_full_name = state.repo_name
-
-    state.repo_created = True
-    state.save(state_path)
+        match = _GH_URL_RE.search(first_line)
+        if not match:
+            raise CLIError(
+                "gh repo create", 0, f"Could not parse repository from: {url}"
+            )
+        state.repo_full_name = match.group(1)
+
+        git_script(
+            [
+                ["remote", "add", "origin", gh_git_remote_url(state.repo_full_name)],
+                ["push", "-u", "origin", "main"],
+            ],
+            project_dir,
+        )
+
+    state.record_delta(
+        state_path,
+        repo_name=state.repo_name,
+        repo_full_name=state.repo_full_name,
+        repo_created=True,
+    )
     logger.info("Repo ready: %s", state.repo_full_name)
 
 
+def _project_has_git(path: str) -> bool:
+    """Return True if `path` has a .git entry (a directory, or the file a
+    worktree uses), with one lstat."""
+    try:
+        os.lstat(os.path.join(path, ".git"))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _init_local_repo(state: AgentState, project_dir: str) -> None:
+    """Create the initial README and .gitignore and commit them on main."""
+    readme_path = os.path.join(project_dir, "README.md")
+    with open(readme_path, "w") as f:
+        f.write(f"# {state.repo_name}\n\n{state.project_idea}\n")
+
+    # Ensure state dir is always gitignored. One open: "a+" creates the
+    # file if needed, reads from the start, and appends.
+    gitignore_path = os.path.join(project_dir, ".gitignore")
+    with open(gitignore_path, "a+") as f:
+        f.seek(0)
+        if "state/" not in f.read().splitlines():
+            f.write("\n# Agent state\nstate/\n")
+
+    # Files first, so init and the first commit share one shell
+    git_script(
+        [
+            ["init"],
+            ["branch", "-M", "main"],
+            ["add", "-A"],
+            ["commit", "-m", "Initial commit"],
+        ],
+        project_dir,
+    )
+
+
 def generate_scaffolding(
     state: AgentState,
     plan_content: str,
@@ -100,15 +140,19 @@ def generate_scaffolding(
     claude_code_implement(prompt, cwd=state.project_dir, timeout=600)
 
     # Commit and push scaffolding
-    git_add_all(state.project_dir)
     try:
-        git_commit("Add initial project scaffolding", state.project_dir)
-        git_push(state.project_dir)
+        git_script(
+            [
+                ["add", "-A"],
+                ["commit", "-m", "Add initial project scaffolding"],
+                ["push"],
+            ],
+            state.project_dir,
+        )
     except Exception as e:
         logger.warning("Commit/push scaffolding: %s", e)
 
-    state.scaffolding_done = True
-    state.save(state_path)
+    state.record_delta(state_path, scaffolding_done=True)
     logger.info("Scaffolding generated and pushed")
 
 
@@ -131,6 +175,5 @@ def create_staging_branch(state: AgentState, state_path: str) -> None:
     git_checkout("staging", cwd, create=True)
     git_push(cwd, "staging", set_upstream=True)
 
-    state.staging_branch_created = True
-    state.save(state_path)
+    state.record_delta(state_path, staging_branch_created=True)
     logger.info("Staging branch created and pushed")
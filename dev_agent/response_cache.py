@@ -0,0 +1,120 @@
+"""On-disk SQLite cache for deterministic text-generation calls."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "dev_agent",
+    "responses.sqlite3",
+)
+
+
+class ResponseCache:
+    """Maps sha256(model, system, prompt) to a previously generated response."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_days: float = 7):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, model TEXT, response TEXT, created REAL)"
+        )
+        # Expired rows are never read again; drop them so the file stays bounded
+        self._conn.execute(
+            "DELETE FROM cache WHERE created <= ?", (time.time() - self.ttl_seconds,)
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, system: str = "") -> str:
+        return hashlib.sha256(
+            (model + "\0" + system + "\0" + prompt).encode()
+        ).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM cache WHERE key = ? AND created > ?",
+                (key, cutoff),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, model, response, created) "
+                "VALUES (?, ?, ?, ?)",
+                (key, model, response, time.time()),
+            )
+            self._conn.commit()
+
+
+_cache: ResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    """Return the process-wide cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                os.environ.get("DEV_AGENT_CACHE_PATH", DEFAULT_CACHE_PATH)
+            )
+        return _cache
+
+
+def cached_call(model: Callable[[], str]) -> Callable:
+    """Decorator caching `fn(prompt, ..., system=...)` results on disk.
+
+    `model` is called with the same arguments, by keyword, and returns the
+    name of the model that would serve the call, so switching backends or
+    tiers never returns another model's answer.
+    Pass `cache=False` to the wrapped function for calls whose answer may be
+    rejected and retried; set DEV_AGENT_NO_CACHE=1 to bypass it entirely.
+    """
+
+    def decorator(fn: Callable[..., str]) -> Callable[..., str]:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, cache: bool = True, **kwargs) -> str:
+            if not cache or os.environ.get("DEV_AGENT_NO_CACHE"):
+                return fn(*args, **kwargs)
+
+            # Bind so a positional `system` keys the same as a keyword one
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            call = bound.arguments
+            model_name = model(**call)
+            store = get_cache()
+            key = store.make_key(model_name, call["prompt"], call.get("system") or "")
+            cached = store.get(key)
+            if cached is not None:
+                logger.info("  [response-cache] Hit (%s...)", key[:8])
+                return cached
+
+            response = fn(*args, **kwargs)
+            if response:
+                store.put(key, model_name, response)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 import tempfile
-from dataclasses import asdict, dataclass, field
+import threading
+from dataclasses import asdict, dataclass, field, is_dataclass
 from enum import Enum
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 
 class StepStatus(str, Enum):
     PENDING = "pending"
@@ -15,6 +24,41 @@ class StepStatus(str, Enum):
     FAILED = "failed"
 
 
+# Serializes saves from concurrent pipeline threads
+_save_lock = threading.Lock()
+
+# Last bytes written per state path, so unchanged saves skip the disk
+_last_saved: dict[str, bytes] = {}
+
+
+# orjson walks dataclasses natively, so asdict()'s deep copy is only
+# needed for the stdlib json fallback.
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    if is_dataclass(data):
+        data = asdict(data)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _dumps_line(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data) + b"\n"
+    if is_dataclass(data):
+        data = asdict(data)
+    return json.dumps(data).encode("utf-8") + b"\n"
+
+
+def _wal_path(path: str) -> str:
+    return path + ".wal"
+
+
+def _loads(raw: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 # Ordered sub-steps for each issue's lifecycle
 SUB_STEPS = [
     "not_started",
@@ -28,9 +72,10 @@ SUB_STEPS = [
     "pr_merged",
     "issue_closed",
 ]
+_SUB_STEP_IDX = {name: i for i, name in enumerate(SUB_STEPS)}
 
 
-@dataclass
+@dataclass(slots=True)
 class IssueState:
     index: int
     title: str
@@ -44,12 +89,10 @@ class IssueState:
 
     def past_step(self, step_name: str) -> bool:
         """Return True if this issue has already completed the given sub-step."""
-        current_idx = SUB_STEPS.index(self.sub_step)
-        target_idx = SUB_STEPS.index(step_name)
-        return current_idx >= target_idx
+        return _SUB_STEP_IDX[self.sub_step] >= _SUB_STEP_IDX[step_name]
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     # Project identity
     project_idea: str = ""
@@ -74,27 +117,126 @@ class AgentState:
     # --- Persistence ---
 
     def save(self, path: str) -> None:
-        """Atomic write: write to temp file then rename."""
+        """Atomic write: write to temp file then rename.
+
+        Safe to call from multiple threads; saves are serialized so readers
+        only ever see a complete snapshot. A save whose content matches the
+        last one written to `path` is skipped. Either way the snapshot now
+        matches memory, so any write-ahead log from append_delta is dropped.
+        """
         dir_name = os.path.dirname(path)
-        os.makedirs(dir_name, exist_ok=True)
-        fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".json")
-        try:
-            with os.fdopen(fd, "w") as f:
-                json.dump(asdict(self), f, indent=2)
-            os.replace(tmp_path, path)
-        except Exception:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            raise
+        with _save_lock:
+            data = _dumps(self)
+            if _last_saved.get(path) == data and os.path.exists(path):
+                _discard_wal(path)
+                return
+            os.makedirs(dir_name, exist_ok=True)
+            _atomic_write(path, data)
+            _last_saved[path] = data
+            _discard_wal(path)
+
+    def append_delta(self, path: str, issue: IssueState) -> None:
+        """Persist one issue's fields by appending a line to the state's
+        write-ahead log, instead of rewriting the whole snapshot.
+
+        load() replays the log over the snapshot; the next save() folds it
+        in. Use for per-issue step progress.
+        """
+        line = _dumps_line(issue)
+        with _save_lock:
+            with open(_wal_path(path), "ab") as f:
+                f.write(line)
+
+    def record_delta(self, path: str, **fields) -> None:
+        """Set top-level fields and persist them as one write-ahead log line.
+
+        For pipeline milestones (repo_created=True, ...) that would
+        otherwise rewrite the whole snapshot to flip a flag.
+        """
+        line = _dumps_line({"fields": fields})
+        with _save_lock:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            with open(_wal_path(path), "ab") as f:
+                f.write(line)
 
     @classmethod
     def load(cls, path: str) -> AgentState:
-        with open(path) as f:
-            data = json.load(f)
+        """Read the snapshot and replay the write-ahead log over it.
+
+        A replayed log is then folded into a fresh snapshot.
+        """
+        with open(path, "rb") as f:
+            data = _loads(f.read())
         state = cls()
-        for key, value in data.items():
+        for key, value in _known_fields(cls, data).items():
             if key == "issues":
-                state.issues = [IssueState(**iss) for iss in value]
+                state.issues = [
+                    IssueState(**_known_fields(IssueState, iss)) for iss in value
+                ]
             else:
                 setattr(state, key, value)
+
+        # Replay deltas written since the snapshot
+        try:
+            with open(_wal_path(path), "rb") as f:
+                for line in f:
+                    try:
+                        delta = _loads(line)
+                    except ValueError:
+                        break  # Torn final line from an interrupted write
+                    if "fields" in delta:
+                        for key, value in _known_fields(cls, delta["fields"]).items():
+                            setattr(state, key, value)
+                    else:
+                        state.issues[delta["index"]] = IssueState(
+                            **_known_fields(IssueState, delta)
+                        )
+        except FileNotFoundError:
+            return state
+        state.save(path)
         return state
+
+
+def _known_fields(cls: type, data: dict) -> dict:
+    """Return the entries of `data` that are fields of dataclass `cls`.
+
+    Slotted instances reject any other attribute, so keys written by another
+    agent version (or a hand edit) are logged and dropped instead.
+    """
+    names = cls.__dataclass_fields__.keys()
+    unknown = data.keys() - names
+    if not unknown:
+        return data
+    logger.warning(
+        "  [state] Ignoring unknown %s fields: %s",
+        cls.__name__,
+        ", ".join(sorted(unknown)),
+    )
+    return {key: value for key, value in data.items() if key in names}
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Replace `path` with `data`; readers see the old or the new file.
+
+    The temp file is fsynced before the rename, so a crash cannot leave
+    `path` pointing at a file whose data never reached the disk.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".json")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _discard_wal(path: str) -> None:
+    try:
+        os.unlink(_wal_path(path))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,85 @@
+"""Tests for conflict region detection and hunk splicing."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from dev_agent import conflict_resolver as cr
+
+CONFLICT = "<<<<<<< HEAD\nours\n=======\ntheirs\n>>>>>>> feature\n"
+
+
+def _file_with_conflicts(padding: int) -> list[str]:
+    filler = [f"line {i}\n" for i in range(padding)]
+    text = "".join(filler) + CONFLICT + "".join(filler) + CONFLICT + "".join(filler)
+    return text.splitlines(keepends=True)
+
+
+class ConflictRegionsTest(unittest.TestCase):
+    def test_regions_include_context(self):
+        lines = _file_with_conflicts(50)
+        self.assertEqual(cr._conflict_regions(lines, 2), [(48, 57), (103, 112)])
+
+    def test_touching_regions_merge(self):
+        lines = _file_with_conflicts(3)
+        self.assertEqual(cr._conflict_regions(lines, 2), [(1, 18)])
+
+    def test_unterminated_block_returns_nothing(self):
+        lines = ["a\n", "<<<<<<< HEAD\n", "ours\n", "=======\n"]
+        self.assertEqual(cr._conflict_regions(lines, 2), [])
+
+
+class ResolveHunksTest(unittest.TestCase):
+    def setUp(self):
+        self.lines = _file_with_conflicts(50)
+        self.regions = cr._conflict_regions(self.lines, 2)
+
+    def _resolve(self, reply):
+        with mock.patch.object(cr, "claude_generate", return_value=reply):
+            return cr._resolve_hunks(self.lines, self.regions, "f.py", "feature")
+
+    def test_hunks_are_spliced_in_place(self):
+        reply = (
+            "<HUNK 1>\nline 48\nline 49\nmerged one\nline 0\nline 1\n</HUNK>\n"
+            "<HUNK 2>\nline 48\nline 49\nmerged two\nline 0\nline 1\n</HUNK>"
+        )
+        resolved = self._resolve(reply)
+        expected = "".join(self.lines).replace(CONFLICT, "merged one\n", 1)
+        expected = expected.replace(CONFLICT, "merged two\n", 1)
+        self.assertEqual(resolved, expected)
+
+    def test_missing_hunk_returns_none(self):
+        self.assertIsNone(self._resolve("<HUNK 1>\nmerged\n</HUNK>"))
+
+    def test_leftover_marker_returns_none(self):
+        reply = "<HUNK 1>\nmerged\n=======\n</HUNK>\n<HUNK 2>\nmerged\n</HUNK>"
+        self.assertIsNone(self._resolve(reply))
+
+
+class StripConflictMarkersTest(unittest.TestCase):
+    def test_keeps_incoming_side(self):
+        text = "a\n" + CONFLICT + "b\n"
+        self.assertEqual(cr._strip_conflict_markers(text), "a\ntheirs\nb\n")
+
+    def test_diff3_base_is_dropped(self):
+        text = "<<<<<<< HEAD\nours\n||||||| base\nbase\n=======\ntheirs\n>>>>>>> f\n"
+        self.assertEqual(cr._strip_conflict_markers(text), "theirs\n")
+
+
+class ResolveOneTest(unittest.TestCase):
+    def test_non_utf8_file_is_not_rewritten(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = b"caf\xe9\n" + CONFLICT.encode()
+            with open(os.path.join(tmp, "latin1.txt"), "wb") as f:
+                f.write(data)
+            with mock.patch.object(cr, "claude_generate") as generate:
+                with self.assertRaises(ValueError):
+                    cr._resolve_one(tmp, "latin1.txt", "feature")
+            generate.assert_not_called()
+            with open(os.path.join(tmp, "latin1.txt"), "rb") as f:
+                self.assertEqual(f.read(), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Tests for the issue pipeline's text helpers."""
+
+import unittest
+
+from dev_agent.issue_processor import (
+    _parse_test_results,
+    _truncate_diff_for_prompt,
+    slugify,
+)
+
+
+class SlugifyTest(unittest.TestCase):
+    def test_collapses_and_trims_separators(self):
+        self.assertEqual(slugify("  Add user login (OAuth2)!! "), "add-user-login-oauth2")
+
+    def test_non_ascii_is_dropped(self):
+        self.assertEqual(slugify("Café — menu"), "caf-menu")
+
+    def test_truncates_to_fifty_chars(self):
+        slug = slugify("word " * 30)
+        self.assertLessEqual(len(slug), 50)
+        self.assertTrue(slug.startswith("word-word"))
+
+
+class ParseTestResultsTest(unittest.TestCase):
+    def test_parses_block(self):
+        output = (
+            "Ran things.\nTEST_RESULTS_START\n"
+            "1. PASS | Server starts\n"
+            "2. FAIL | Login works | 500 from /login\n"
+            "TEST_RESULTS_END\ntrailing"
+        )
+        self.assertEqual(
+            _parse_test_results(output),
+            [
+                {"number": 1, "status": "PASS", "description": "Server starts", "reason": ""},
+                {"number": 2, "status": "FAIL", "description": "Login works", "reason": "500 from /login"},
+            ],
+        )
+
+    def test_missing_block(self):
+        with self.assertLogs("dev_agent.issue_processor", "WARNING"):
+            self.assertEqual(_parse_test_results("no results here"), [])
+
+
+class TruncateDiffTest(unittest.TestCase):
+    def test_keeps_whole_sections_within_budget(self):
+        sections = ["diff --git a/x b/x\n+1\n", "diff --git a/y b/y\n+2\n"]
+        self.assertEqual(_truncate_diff_for_prompt(iter(sections)), "".join(sections).rstrip("\n"))
+
+    def test_counts_omitted_files(self):
+        small = "diff --git a/a b/a\n+ok\n"
+        big = "diff --git a/b b/b\n" + "+x\n" * 100
+        text = _truncate_diff_for_prompt(iter([small, big, big]), token_budget=20)
+        self.assertTrue(text.startswith(small))
+        self.assertTrue(text.endswith("... [2 more file(s) truncated]"))
+
+    def test_oversized_first_section_is_cut_at_a_line(self):
+        big = "diff --git a/b b/b\n" + "+line\n" * 100
+        text = _truncate_diff_for_prompt(iter([big]), token_budget=10)
+        head, marker = text.rsplit("\n", 1)
+        self.assertTrue(big.startswith(head + "\n"))
+        self.assertEqual(marker, "... [rest of this file truncated]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""Tests for dependency ordering of generated issues."""
+
+import unittest
+
+from dev_agent.planner import _topological_sort_issues
+
+
+def _issue(title, phase, *deps):
+    return {"title": title, "phase": phase, "dependencies": list(deps)}
+
+
+def _titles(issues):
+    return [iss["title"] for iss in issues]
+
+
+class TopologicalSortTest(unittest.TestCase):
+    def test_no_dependencies_is_a_stable_phase_sort(self):
+        issues = [_issue("b", 2), _issue("a", 1), _issue("c", 2), _issue("d", 1)]
+        self.assertEqual(_titles(_topological_sort_issues(issues)), ["a", "d", "b", "c"])
+
+    def test_dependencies_come_first_within_a_phase(self):
+        issues = [
+            _issue("api", 1, "models"),
+            _issue("ui", 1, "api"),
+            _issue("models", 1),
+            _issue("docs", 1),
+        ]
+        self.assertEqual(
+            _titles(_topological_sort_issues(issues)),
+            ["models", "docs", "api", "ui"],
+        )
+
+    def test_cross_phase_dependencies_count_as_satisfied(self):
+        issues = [_issue("later", 2, "earlier"), _issue("earlier", 1)]
+        self.assertEqual(_titles(_topological_sort_issues(issues)), ["earlier", "later"])
+
+    def test_cycle_is_appended_in_input_order(self):
+        issues = [
+            _issue("x", 1, "y"),
+            _issue("free", 1),
+            _issue("y", 1, "x"),
+        ]
+        self.assertEqual(_titles(_topological_sort_issues(issues)), ["free", "x", "y"])
+
+    def test_duplicate_and_self_dependencies(self):
+        issues = [_issue("a", 1, "a", "b", "b"), _issue("b", 1)]
+        self.assertEqual(_titles(_topological_sort_issues(issues)), ["b", "a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
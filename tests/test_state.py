@@ -0,0 +1,101 @@
+"""Round-trip tests for AgentState snapshots and the write-ahead log."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from dev_agent import state as state_mod
+from dev_agent.state import AgentState, IssueState, StepStatus
+
+
+def _sample_state() -> AgentState:
+    state = AgentState(project_idea="Todo app é", tech_stack="python")
+    state.issues = [
+        IssueState(index=i, title=f"Issue {i}", phase=1 + i % 2, priority="high")
+        for i in range(3)
+    ]
+    state.issues[1].status = StepStatus.COMPLETED
+    state.issues[1].pr_number = 7
+    state.phases_merged = [1]
+    return state
+
+
+class StateRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "state", "agent_state.json")
+
+    def tearDown(self):
+        state_mod._last_saved.pop(self.path, None)
+        self.tmp.cleanup()
+
+    def _assert_round_trip(self):
+        original = _sample_state()
+        original.save(self.path)
+        loaded = AgentState.load(self.path)
+        self.assertEqual(loaded, original)
+        self.assertEqual(loaded.issues[1].status, StepStatus.COMPLETED)
+
+    @unittest.skipIf(state_mod.orjson is None, "orjson not installed")
+    def test_round_trip_orjson(self):
+        self._assert_round_trip()
+
+    def test_round_trip_stdlib_json(self):
+        with mock.patch.object(state_mod, "orjson", None):
+            self._assert_round_trip()
+
+    @unittest.skipIf(state_mod.orjson is None, "orjson not installed")
+    def test_orjson_and_stdlib_snapshots_agree(self):
+        state = _sample_state()
+        with_orjson = state_mod._dumps(state)
+        with mock.patch.object(state_mod, "orjson", None):
+            without = state_mod._dumps(state)
+        self.assertEqual(json.loads(with_orjson), json.loads(without))
+
+    def test_wal_replay_and_fold(self):
+        state = _sample_state()
+        state.save(self.path)
+        state.issues[0].sub_step = "pr_created"
+        state.issues[0].pr_number = 12
+        state.append_delta(self.path, state.issues[0])
+        state.record_delta(self.path, repo_created=True)
+
+        loaded = AgentState.load(self.path)
+        self.assertEqual(loaded, state)
+        # The replayed log is folded into a fresh snapshot
+        self.assertFalse(os.path.exists(self.path + ".wal"))
+        with open(self.path) as f:
+            self.assertTrue(json.load(f)["repo_created"])
+
+    def test_torn_final_wal_line_is_ignored(self):
+        state = _sample_state()
+        state.save(self.path)
+        state.issues[2].sub_step = "branch_created"
+        state.append_delta(self.path, state.issues[2])
+        with open(self.path + ".wal", "ab") as f:
+            f.write(b'{"index": 0, "title": "Iss')
+
+        loaded = AgentState.load(self.path)
+        self.assertEqual(loaded.issues[2].sub_step, "branch_created")
+        self.assertEqual(loaded.issues[0].sub_step, "not_started")
+
+    def test_unknown_keys_are_dropped(self):
+        _sample_state().save(self.path)
+        with open(self.path) as f:
+            data = json.load(f)
+        data["added_in_a_later_version"] = 1
+        data["issues"][0]["extra"] = "x"
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        with open(self.path + ".wal", "w") as f:
+            f.write(json.dumps({"fields": {"unknown_flag": True}}) + "\n")
+
+        with self.assertLogs("dev_agent.state", "WARNING"):
+            loaded = AgentState.load(self.path)
+        self.assertEqual(loaded, _sample_state())
+
+
+if __name__ == "__main__":
+    unittest.main()